@@ -0,0 +1,248 @@
+"""
+Benchmarks for the simulation, drawing and training hot paths.
+
+Runs under SDL's dummy video driver with fixed seeds, so it works on machines without a display:
+
+    python benchmark.py                           # print results
+    python benchmark.py --output baseline.json    # save them
+    python benchmark.py --baseline baseline.json  # compare, exit with status 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+# Population sizes timed for one headless generation
+POPULATION_SIZES = (25, 50, 150)
+
+
+def measure(func, number, repeat=5):
+    """Median seconds per call of ``func`` over ``repeat`` runs of ``number`` calls."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return statistics.median(timings)
+
+
+class Results:
+    def __init__(self):
+        # name -> {'value', 'unit', 'higher_is_better'}
+        self.values = {}
+
+    def add(self, name, value, unit, higher_is_better=False):
+        self.values[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"  {name:<36} {value:12.3f} {unit}", flush=True)
+
+    def add_time(self, name, seconds):
+        self.add(name, seconds * 1000, 'ms')
+
+
+def bench_simulation(results, scale):
+    from src.ball import Ball
+    from src.paddle import Paddle
+    from src.physics import BallBody, LEFT, RIGHT, PADDLE_X
+    from src.config import WIDTH, HEIGHT, PADDLE_HEIGHT, SPEED_RATE, SIMULATION_RATE
+
+    ball = Ball(BallBody(random.Random(0)))
+    paddles = [Paddle(PADDLE_X[side], HEIGHT // 2 - PADDLE_HEIGHT // 2) for side in (LEFT, RIGHT)]
+    dt = SPEED_RATE / SIMULATION_RATE
+
+    def tick():
+        ball.move(dt)
+        ball.check_paddle_collision(paddles[LEFT]) or ball.check_paddle_collision(paddles[RIGHT])
+        if not 0 < ball.body.rect_x < WIDTH:
+            ball.reset()
+
+    results.add('simulation.ball_tick', 1 / measure(tick, 2000 * scale), 'ticks/s', higher_is_better=True)
+
+
+def bench_draw(results, scale):
+    import pygame
+    import numpy as np
+    from src.background import Background
+    from src.ball import Ball
+    from src.button import Button
+    from src.config import WIDTH, HEIGHT, BLUE, RED, PADDLE_HEIGHT
+    from src.ice_particle import IceField
+    from src.paddle import Paddle
+    from src.particle import ParticleSystem
+    from src.physics import BallBody, LEFT, RIGHT, PADDLE_X
+
+    screen = pygame.display.get_surface()
+    background = Background()
+    background.ice_field = IceField(background.ice_field.count, np.random.default_rng(0))
+    paddle = Paddle(PADDLE_X[LEFT], HEIGHT // 2 - PADDLE_HEIGHT // 2, BLUE)
+    paddle.hit_animation = 1.0
+    ball = Ball(BallBody(random.Random(0)), RED)
+    for _ in range(ball.max_trail_length):
+        ball.save_position()
+        ball.move()
+        ball.show(1.0)
+    button = Button(WIDTH // 2, HEIGHT // 2, 200, 50, "Benchmark", pygame.font.Font(None, 50), BLUE, (100, 150, 255))
+    particles = ParticleSystem(1024)
+    particles.rng = np.random.default_rng(0)
+    ice = IceField(30, np.random.default_rng(0))
+
+    def draw_particles():
+        # Keep a steady population of about 300 particles
+        particles.spawn(WIDTH // 2, HEIGHT // 2, RED, 15)
+        particles.update()
+        particles.draw(screen)
+
+    def draw_paddle():
+        # Keep the hit flash on, the most expensive case
+        paddle.hit_animation = 1.0
+        paddle.draw(screen)
+
+    number = 200 * scale
+    results.add_time('draw.background', measure(lambda: background.draw(screen), number))
+    results.add_time('draw.paddle', measure(draw_paddle, number))
+    results.add_time('draw.ball', measure(lambda: ball.draw(screen), number))
+    results.add_time('draw.button', measure(lambda: button.draw(screen), number))
+    results.add_time('draw.particles', measure(draw_particles, number))
+    results.add_time('draw.ice', measure(lambda: (ice.update(), ice.draw(screen)), number))
+
+
+def bench_game_frames(results, scale):
+    from src import Game
+    from src.config import MENU, MODE_SELECT, CONTROLS, PLAYING, GAME_OVER, PVAI
+    from src.dirty_rects import DirtyRectRenderer
+
+    game = Game()
+    # Uncapped, so each frame costs only its own work
+    game.frame_rate = 0
+    game.game_mode = PVAI
+    frames = 60 * scale
+    for name, state in (('menu', MENU), ('mode_select', MODE_SELECT), ('controls', CONTROLS),
+                        ('playing', PLAYING), ('game_over', GAME_OVER)):
+        def run_frames():
+            game.game_state = state
+            game.player.score = game.opponent.score = 0
+            game.run(max_frames=frames)
+        results.add_time(f'frame.{name}', measure(run_frames, 1) / frames)
+
+    # Share of the window dirty-rect presentation pushes per frame, the screen switch's full flip included
+    game = Game(dirty_rects=True)
+    game.frame_rate = 0
+    game.game_mode = PVAI
+    screen_area = game.screen.get_width() * game.screen.get_height()
+    for name, state in (('menu', MENU), ('mode_select', MODE_SELECT), ('controls', CONTROLS),
+                        ('playing', PLAYING), ('game_over', GAME_OVER)):
+        game.renderer = DirtyRectRenderer(game.screen)
+        game.game_state = state
+        game.player.score = game.opponent.score = 0
+        game.run(max_frames=frames)
+        results.add(f'dirty_rects.{name}', 100 * game.renderer.average_pushed_pixels() / screen_area, '%')
+
+
+def bench_generations(results, scale, sizes):
+    import neat
+    import src.ai_trainer as ai_trainer
+    from src.ai_trainer import AITrainer
+    from src.settings import TrainingSettings
+
+    for size in sizes:
+        # Without the fitness cache, which would score every repeat from memory
+        trainer = AITrainer(None, TrainingSettings(headless=True, seed=0, fitness_cache=0))
+        trainer.config.pop_size = size
+        random.seed(0)
+        population = neat.Population(trainer.config)
+        genomes = list(population.population.items())
+
+        def generation():
+            ai_trainer.GEN = 0
+            trainer.eval_genomes(genomes, trainer.config)
+
+        results.add_time(f'generation.pop_{size}', measure(generation, 1, repeat=max(1, scale)))
+        trainer.evaluator.close()
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against ``baseline`` and return the names of regressed benchmarks."""
+    regressions = []
+    print(f"\nCompared with the baseline (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"  {name:<36} new")
+            continue
+        old, new = baseline[name]['value'], result['value']
+        change = (new - old) / old if old else 0.0
+        worse = -change if result['higher_is_better'] else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:<36} {old:12.3f} -> {new:12.3f} {result['unit']:<8} {change:+7.1%} {flag}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark simulation, drawing and training")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="fraction a result may get worse than the baseline (default 0.15)")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions and only small populations")
+    parser.add_argument("--only", choices=["simulation", "draw", "frames", "generations"], action="append",
+                        help="run only these groups (repeatable)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    scale = 1 if args.quick else 3
+    groups = args.only or ["simulation", "draw", "frames", "generations"]
+
+    import numpy as np
+    import pygame
+    from src.config import WIDTH, HEIGHT
+    from src.display import init_pygame
+    random.seed(0)
+    np.random.seed(0)
+    init_pygame()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = Results()
+    print("Benchmarks:")
+    if "simulation" in groups:
+        bench_simulation(results, scale)
+    if "draw" in groups:
+        bench_draw(results, scale)
+    if "frames" in groups:
+        bench_game_frames(results, scale)
+    if "generations" in groups:
+        bench_generations(results, scale, POPULATION_SIZES[:2] if args.quick else POPULATION_SIZES)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results.values,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results.values, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,80 @@
-from src import Game
+import argparse
+import sys
 
-if __name__ == "__main__":
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pong with NEAT-trained AI paddles")
+    parser.add_argument("--train", action="store_true", help="start NEAT training instead of the game menu")
+    parser.add_argument("--resume", action="store_true", help="continue training from the newest checkpoint")
+    parser.add_argument("--headless", action="store_true", help="train without the training window")
+    parser.add_argument("--workers", type=int, help="processes used to evaluate genomes, 0 for one per CPU core")
+    parser.add_argument("--islands", type=int, help="evolve this many populations in parallel (island model)")
+    parser.add_argument("--distributed", action="store_true", help="evaluate genomes on remote workers over TCP")
+    parser.add_argument("--worker", action="store_true", help="run as a headless evaluation worker")
+    parser.add_argument("--host", help="coordinator address (overrides config.txt)")
+    parser.add_argument("--port", type=int, help="coordinator port (overrides config.txt)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="push only the changed parts of each frame to the window")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each update and draw phase from the start (F3 shows them, F4 saves them)")
+    parser.add_argument("--profile-output", metavar="PATH",
+                        help="save profiled frames here on exit, as CSV for .csv paths, otherwise a JSON trace")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="start up to the first menu frame, print import and startup timings, then exit")
+    parser.add_argument("--startup-budget", type=float, metavar="SECONDS",
+                        help="start up to the first menu frame and exit with status 1 if that took longer")
+    return parser
+
+
+def check_startup(report, budget):
+    from src.startup import StartupTimer
+    timer = StartupTimer()
+    from src import Game
+    timer.mark("import game modules")
     game = Game()
-    game.run() 
\ No newline at end of file
+    timer.mark("Game()")
+    game.run(max_frames=1)
+    timer.mark("first menu frame")
+
+    if report:
+        from src.text import text_cache_stats
+        print(timer.report())
+        print("Text cache: {hits} hits, {misses} misses, {entries} surfaces".format(**text_cache_stats()))
+    if budget is not None and timer.total() > budget:
+        print(f"Startup took {timer.total():.3f}s, over the {budget:.3f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.train or args.worker:
+        from src.settings import TrainingSettings
+        settings = TrainingSettings.from_file()
+        if args.host is not None:
+            settings.host = args.host
+        if args.port is not None:
+            settings.port = args.port
+        if args.headless:
+            settings.headless = True
+        if args.workers is not None:
+            settings.workers = args.workers
+        if args.islands is not None:
+            settings.islands = args.islands
+        if args.distributed:
+            settings.distributed = True
+        if args.resume and settings.islands > 1:
+            parser.error("--resume is not supported with islands; set islands to 1 to resume a run")
+    if args.worker:
+        from src.distributed import run_worker
+        run_worker(settings.host, settings.port)
+    elif args.train:
+        from src.ai_trainer import AITrainer
+        AITrainer(None, settings).run_neat(resume=args.resume)
+    elif args.startup_report or args.startup_budget is not None:
+        check_startup(args.startup_report, args.startup_budget)
+    else:
+        from src import Game
+        game = Game(dirty_rects=args.dirty_rects, profile=args.profile or args.profile_output is not None,
+                    profile_output=args.profile_output)
+        game.run()
@@ -1,9 +1,22 @@
-from .main import Game
+import importlib
 from .config import *
-from .paddle import Paddle
-from .ball import Ball
-from .background import Background
-from .button import Button
-from .particle import Particle
 
-__all__ = ['Game', 'Paddle', 'Ball', 'Background', 'Button', 'Particle'] 
\ No newline at end of file
+# The game classes need pygame, so they are imported on first use; the headless simulation
+# (physics, vector_engine, evaluation, ...) can then be imported without initialising SDL
+_LAZY_CLASSES = {
+    'Game': '.main',
+    'Paddle': '.paddle',
+    'Ball': '.ball',
+    'Background': '.background',
+    'Button': '.button',
+    'Particle': '.particle',
+    'ParticleSystem': '.particle',
+}
+
+__all__ = ['Game', 'Paddle', 'Ball', 'Background', 'Button', 'Particle', 'ParticleSystem']
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        return getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
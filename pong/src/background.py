@@ -1,18 +1,84 @@
 import pygame
 import random
-from .config import GRADIENT_COLORS, GRADIENT_SPEED, CENTER_LINE_DASH_LENGTH, CENTER_LINE_GAP, CENTER_LINE_SPEED, HEIGHT, WIDTH, WHITE
-from .particle import Particle
-from .ice_particle import IceParticle
+from .config import GRADIENT_COLORS, GRADIENT_SPEED, CENTER_LINE_DASH_LENGTH, CENTER_LINE_GAP, CENTER_LINE_SPEED, HEIGHT, WIDTH, WHITE, BLACK
+from .config import STAR_TWINKLE_GROUPS, PARTICLE_CAPACITY, ICE_PARTICLE_COUNT
+from .particle import ParticleSystem
+from .ice_particle import IceField
 
 class Background:
     def __init__(self):
         self.gradient_offset = 0
         self.center_line_offset = 0
-        self.particles = []
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
         self.grid_size = 100
         self.grid_opacity = 20
         self.stars = [(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(100)]
-        self.ice_particles = [IceParticle() for _ in range(30)]  # Create 30 ice particles
+        self.ice_field = IceField(ICE_PARTICLE_COUNT)
+
+        # Static layers, rendered once and then only blitted
+        self.gradient = self.bake_gradient()
+        self.star_sprites = self.bake_star_sprites()
+        # Top-left corners of each twinkle group's star sprites
+        self.star_groups = [[(x - 1, y - 1) for x, y in self.stars[group::STAR_TWINKLE_GROUPS]]
+                            for group in range(STAR_TWINKLE_GROUPS)]
+        self.star_rects = [pygame.Rect(x - 1, y - 1, 3, 3) for x, y in self.stars]
+        # Gradient row drawn last frame, and the screen strips the last draw changed by scrolling it
+        self.gradient_row = None
+        self.gradient_strips = [pygame.Rect(0, 0, WIDTH, HEIGHT)]
+        # (previous row, row) -> strips whose color differs between the two, filled in as needed
+        self.strip_cache = {}
+
+    @staticmethod
+    def bake_gradient():
+        """
+        Render the gradient for every offset it can scroll to into one tall texture, so drawing it
+        is a single blit of a HEIGHT-row window. Offsets are used in whole pixels.
+        """
+        rows = HEIGHT + len(GRADIENT_COLORS)
+        texture = pygame.Surface((WIDTH, rows))
+        for y in range(rows):
+            color_index = int(y / HEIGHT * len(GRADIENT_COLORS)) % len(GRADIENT_COLORS)
+            next_color_index = (color_index + 1) % len(GRADIENT_COLORS)
+            progress = (y / HEIGHT * len(GRADIENT_COLORS)) % 1
+            r = int(GRADIENT_COLORS[color_index][0] * (1 - progress) + GRADIENT_COLORS[next_color_index][0] * progress)
+            g = int(GRADIENT_COLORS[color_index][1] * (1 - progress) + GRADIENT_COLORS[next_color_index][1] * progress)
+            b = int(GRADIENT_COLORS[color_index][2] * (1 - progress) + GRADIENT_COLORS[next_color_index][2] * progress)
+            pygame.draw.line(texture, (r, g, b), (0, y), (WIDTH, y))
+        if pygame.display.get_surface() is not None:
+            texture = texture.convert()
+        return texture
+
+    def changed_strips(self, previous, row):
+        """
+        Full-width screen strips whose color differs between the gradient scrolled to row
+        ``previous`` and to row ``row``. A one-row scroll only changes the rows where the color steps.
+        """
+        key = (previous, row)
+        if key not in self.strip_cache:
+            strips = []
+            for y in range(HEIGHT):
+                # Every texture row is a single color
+                if self.gradient.get_at((0, previous + y)) == self.gradient.get_at((0, row + y)):
+                    continue
+                if strips and strips[-1].bottom == y:
+                    strips[-1].height += 1
+                else:
+                    strips.append(pygame.Rect(0, y, WIDTH, 1))
+            self.strip_cache[key] = strips
+        return self.strip_cache[key]
+
+    @staticmethod
+    def bake_star_sprites():
+        """One tiny colorkeyed star per brightness level, so twinkling only picks another sprite."""
+        sprites = {}
+        for brightness in range(100, 256):
+            sprite = pygame.Surface((3, 3))
+            pygame.draw.circle(sprite, (brightness, brightness, brightness), (1, 1), 1)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(BLACK)
+            sprites[brightness] = sprite
+        return sprites
 
     def update(self):
         self.gradient_offset += GRADIENT_SPEED
@@ -21,39 +87,37 @@ class Background:
 
         self.center_line_offset = (self.center_line_offset + 1) % (CENTER_LINE_DASH_LENGTH + CENTER_LINE_GAP)
 
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
 
         # Update ice particles
-        for particle in self.ice_particles:
-            particle.update()
+        self.ice_field.update()
 
     def draw(self, surface):
-        # Draw gradient background
-        for y in range(HEIGHT):
-            color_index = int((y + self.gradient_offset) / HEIGHT * len(GRADIENT_COLORS)) % len(GRADIENT_COLORS)
-            next_color_index = (color_index + 1) % len(GRADIENT_COLORS)
-            progress = ((y + self.gradient_offset) / HEIGHT * len(GRADIENT_COLORS)) % 1
-            r = int(GRADIENT_COLORS[color_index][0] * (1 - progress) + GRADIENT_COLORS[next_color_index][0] * progress)
-            g = int(GRADIENT_COLORS[color_index][1] * (1 - progress) + GRADIENT_COLORS[next_color_index][1] * progress)
-            b = int(GRADIENT_COLORS[color_index][2] * (1 - progress) + GRADIENT_COLORS[next_color_index][2] * progress)
-            pygame.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
+        # Draw gradient background, scrolled by the current offset
+        row = int(self.gradient_offset)
+        if self.gradient_row is None:
+            self.gradient_strips = [pygame.Rect(0, 0, WIDTH, HEIGHT)]
+        elif row != self.gradient_row:
+            self.gradient_strips = self.changed_strips(self.gradient_row, row)
+        else:
+            self.gradient_strips = []
+        self.gradient_row = row
+        surface.blit(self.gradient, (0, 0), (0, row, WIDTH, HEIGHT))
 
-        # Draw stars
-        for x, y in self.stars:
-            brightness = random.randint(100, 255)
-            pygame.draw.circle(surface, (brightness, brightness, brightness), (x, y), 1)
+        # Draw stars, each group with a new random brightness
+        for group in self.star_groups:
+            sprite = self.star_sprites[random.randint(100, 255)]
+            surface.blits([(sprite, position) for position in group], doreturn=False)
 
         # Draw particles
-        for particle in self.particles:
-            particle.draw(surface)
+        self.particles.draw(surface)
 
         # Draw ice particles
-        for particle in self.ice_particles:
-            particle.draw(surface)
+        self.ice_field.draw(surface)
+
+    def dirty_rects(self):
+        """Regions the sprites covered in the last draw; ``gradient_strips`` has what the scroll recolored."""
+        return [*self.star_rects, self.particles.dirty_rect(), *self.ice_field.dirty_rects()]
 
     def add_particles(self, x, y, color, count=3):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color)) 
\ No newline at end of file
+        self.particles.spawn(x, y, color, count) 
\ No newline at end of file
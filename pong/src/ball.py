@@ -1,103 +1,162 @@
 import pygame
-import random
-import math
+from collections import deque
 from pygame import gfxdraw
-from .config import BALL_SIZE, BALL_SPEED, MAX_BALL_SPEED, SPEED_INCREASE, WHITE, HEIGHT, WIDTH
+from .config import BALL_SIZE, WHITE, BALL_SPRITE_CACHE_SIZE
+from .lru import LRUCache
+from .physics import BallBody
 
 class Ball:
-    def __init__(self):
-        self.speed = BALL_SPEED
-        self.reset()
-        self.trail = []
-        self.hit_animation = 0
-        self.last_collision = None
-        self.subpixel_x = 0.0
-        self.subpixel_y = 0.0
+    """Drawing view of a ball; the physics lives in physics.BallBody."""
+    def __init__(self, body=None, color=WHITE):
+        self.body = body if body is not None else BallBody()
+        self.color = color
+        self.rect = pygame.Rect(self.body.rect_x, self.body.rect_y, BALL_SIZE, BALL_SIZE)
         self.max_trail_length = 12
+        # Ring buffer of recent centers; appending to a full one drops the oldest
+        self.trail = deque(maxlen=self.max_trail_length)
+        self.hit_animation = 0
+        # Position before the latest simulation step, for drawing in between steps
+        self.previous = (self.body.x, self.body.y)
+
+    @property
+    def dx(self):
+        return self.body.dx
+
+    @property
+    def dy(self):
+        return self.body.dy
 
     def reset(self):
-        self.rect = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
-        self.dx = self.speed * random.choice([1, -1])
-        self.dy = self.speed * random.choice([1, -1])
-        self.subpixel_x = self.rect.x
-        self.subpixel_y = self.rect.y
-        self.trail = []
+        self.body.reset()
+        self.rect.topleft = (self.body.rect_x, self.body.rect_y)
+        self.trail.clear()
         self.hit_animation = 0
-        self.last_collision = None
-        self.speed = BALL_SPEED
+        self.previous = (self.body.x, self.body.y)
 
-    def move(self):
-        self.subpixel_x += self.dx
-        self.subpixel_y += self.dy
+    def move(self, dt=1.0):
+        self.body.move(dt)
 
-        self.trail.append((self.subpixel_x + BALL_SIZE/2, self.subpixel_y + BALL_SIZE/2))
-        if len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
+    def save_position(self):
+        """Remember where the ball is before a simulation step."""
+        self.previous = (self.body.x, self.body.y)
 
-        self.rect.x = int(self.subpixel_x)
-        self.rect.y = int(self.subpixel_y)
+    def show(self, alpha):
+        """Draw the ball ``alpha`` of the way from its previous to its current step position."""
+        previous_x, previous_y = self.previous
+        x = previous_x + (self.body.x - previous_x) * alpha
+        y = previous_y + (self.body.y - previous_y) * alpha
+        self.sync(x, y, x, y)
 
-        if self.rect.top <= 0 or self.rect.bottom >= HEIGHT:
-            self.dy *= -1
-            if self.rect.top <= 0:
-                self.subpixel_y = 0
-            else:
-                self.subpixel_y = HEIGHT - self.rect.height
+    def sync(self, x, y, subpixel_x, subpixel_y, hit=False):
+        """Show the ball at rect position (x, y); the trail follows the sub-pixel position."""
+        self.trail.append((subpixel_x + BALL_SIZE/2, subpixel_y + BALL_SIZE/2))
+
+        self.rect.x = int(x)
+        self.rect.y = int(y)
+        if hit:
+            self.hit_animation = 1.0
 
     def check_paddle_collision(self, paddle):
-        # Check if ball is moving towards paddle
-        if (self.dx < 0 and paddle.rect.x < WIDTH/2) or (self.dx > 0 and paddle.rect.x > WIDTH/2):
-            if self.rect.colliderect(paddle.rect):
-                relative_intersect_y = (paddle.rect.centery - self.rect.centery) / (paddle.rect.height / 2)
-                bounce_angle = relative_intersect_y * (math.pi / 4)
-                
-                self.speed = min(MAX_BALL_SPEED, self.speed + SPEED_INCREASE)
-                
-                speed = math.sqrt(self.dx * self.dx + self.dy * self.dy)
-                self.dx = speed * math.cos(bounce_angle) * (-1 if self.dx > 0 else 1)
-                self.dy = speed * -math.sin(bounce_angle)
-                
-                self.dy += random.uniform(-0.5, 0.5)
-                
-                min_speed = self.speed
-                current_speed = math.sqrt(self.dx * self.dx + self.dy * self.dy)
-                if current_speed < min_speed:
-                    self.dx *= min_speed / current_speed
-                    self.dy *= min_speed / current_speed
-                
-                self.hit_animation = 1.0
-                paddle.hit_animation = 1.0
-                
-                if paddle.rect.x < WIDTH/2:
-                    self.subpixel_x = paddle.rect.right
-                else:
-                    self.subpixel_x = paddle.rect.left - self.rect.width
-                
-                return True
+        if self.body.collide(paddle.body):
+            self.hit_animation = 1.0
+            paddle.hit_animation = 1.0
+            return True
         return False
 
     def draw(self, screen):
+        screen.blits(self.sprites(), doreturn=False)
+
+    def sprites(self):
+        """
+        The (sprite, position, area, flags) blits for one frame, advancing the hit glow; for
+        callers that batch many balls into a single ``Surface.blits``.
+        """
+        blits = []
+        length = len(self.trail)
         for i, (x, y) in enumerate(self.trail):
-            alpha = int(180 * (i + 1) / len(self.trail))
-            size = BALL_SIZE * (i + 1) / len(self.trail)
-            gfxdraw.aacircle(screen, int(x), int(y), int(size), (*WHITE, alpha))
-            gfxdraw.filled_circle(screen, int(x), int(y), int(size), (*WHITE, alpha))
+            alpha = int(180 * (i + 1) / length)
+            size = int(BALL_SIZE * (i + 1) / length)
+            blits.append((trail_sprite(self.color, size, alpha), (int(x) - size, int(y) - size), None, pygame.BLEND_PREMULTIPLIED))
         
         if self.hit_animation > 0:
-            glow_surface = pygame.Surface((int(BALL_SIZE * 3), int(BALL_SIZE * 3)), pygame.SRCALPHA)
-            alpha = int(255 * (1 - self.hit_animation))
-            gfxdraw.filled_circle(glow_surface, 
-                                int(BALL_SIZE * 1.5), 
-                                int(BALL_SIZE * 1.5), 
-                                int(BALL_SIZE * 1.5), 
-                                (*WHITE, alpha))
-            screen.blit(glow_surface, (self.rect.x - BALL_SIZE, self.rect.y - BALL_SIZE))
+            blits.append((glow_sprite(self.color, self.hit_animation), (self.rect.x - BALL_SIZE, self.rect.y - BALL_SIZE),
+                          None, pygame.BLEND_PREMULTIPLIED))
             self.hit_animation -= 0.1
         
-        for i in range(BALL_SIZE):
-            alpha = int(255 * (1 - i / BALL_SIZE))
-            gfxdraw.filled_circle(screen, 
-                                self.rect.centerx, 
-                                self.rect.centery, 
-                                BALL_SIZE - i, 
-                                (*WHITE, alpha)) 
\ No newline at end of file
+        blits.append((body_sprite(self.color), (self.rect.centerx - BALL_SIZE, self.rect.centery - BALL_SIZE),
+                      None, pygame.BLEND_PREMULTIPLIED))
+        return blits
+
+    def dirty_rect(self):
+        """Area the ball may cover when drawn, including its trail and hit glow."""
+        rect = self.rect.inflate(BALL_SIZE * 2, BALL_SIZE * 2)
+        if self.trail:
+            xs = [int(x) for x, _ in self.trail]
+            ys = [int(y) for _, y in self.trail]
+            trail = pygame.Rect(min(xs) - BALL_SIZE, min(ys) - BALL_SIZE,
+                                max(xs) - min(xs) + BALL_SIZE * 2 + 1, max(ys) - min(ys) + BALL_SIZE * 2 + 1)
+            rect.union_ip(trail)
+        return rect
+
+
+# Pre-rendered, alpha-premultiplied ball sprites shared by every ball. Trainer balls get
+# random colors, so the cache is bounded and drops the least recently drawn sprites.
+SPRITES = LRUCache(BALL_SPRITE_CACHE_SIZE)
+
+
+def _finish(surface):
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface.premul_alpha()
+
+
+def _layer(surface, alpha, draw, *args):
+    # gfxdraw does not blend on SRCALPHA surfaces, so every primitive is drawn opaque on its own
+    # transparent layer, which is then blended onto the sprite with the primitive's alpha. The
+    # layer starts out in the primitive's color so antialiased edges do not fade towards black.
+    layer = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    layer.fill((*args[-1], 0))
+    draw(layer, *args)
+    layer.set_alpha(alpha)
+    surface.blit(layer, (0, 0))
+
+
+def _render_trail(color, size, alpha):
+    surface = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+    _layer(surface, alpha, gfxdraw.aacircle, size, size, size, color)
+    _layer(surface, alpha, gfxdraw.filled_circle, size, size, size, color)
+    return _finish(surface)
+
+
+def _render_glow(color, step):
+    glow_surface = pygame.Surface((int(BALL_SIZE * 3), int(BALL_SIZE * 3)), pygame.SRCALPHA)
+    alpha = int(255 * (1 - step / 10))
+    _layer(glow_surface, alpha, gfxdraw.filled_circle,
+           int(BALL_SIZE * 1.5), 
+           int(BALL_SIZE * 1.5), 
+           int(BALL_SIZE * 1.5), 
+           color)
+    return _finish(glow_surface)
+
+
+def _render_body(color):
+    # Concentric circles fading outwards, centered on the ball rect's center
+    body_surface = pygame.Surface((BALL_SIZE * 2 + 1, BALL_SIZE * 2 + 1), pygame.SRCALPHA)
+    for i in range(BALL_SIZE):
+        alpha = int(255 * (1 - i / BALL_SIZE))
+        _layer(body_surface, alpha, gfxdraw.filled_circle, BALL_SIZE, BALL_SIZE, BALL_SIZE - i, color)
+    return _finish(body_surface)
+
+
+def trail_sprite(color, size, alpha):
+    return SPRITES.get_or_create(('trail', color, size, alpha), lambda: _render_trail(color, size, alpha))
+
+
+def glow_sprite(color, hit_animation):
+    # The hit glow fades in tenths
+    step = round(hit_animation * 10)
+    return SPRITES.get_or_create(('glow', color, step), lambda: _render_glow(color, step))
+
+
+def body_sprite(color):
+    return SPRITES.get_or_create(('body', color), lambda: _render_body(color))
@@ -0,0 +1,135 @@
+"""
+Population-wide feed-forward network inference.
+
+Every genome of a generation is compiled into padded NumPy arrays, so one ``activate`` call
+evaluates any subset of the population on an (N, inputs) batch instead of calling
+``neat.nn.FeedForwardNetwork.activate`` once per genome.
+"""
+import numpy as np
+import neat
+
+# NumPy versions of neat's built-in activation functions, including their input clamping
+ACTIVATIONS = {
+    'sigmoid': lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    'tanh': lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    'sin': lambda z: np.sin(np.clip(5.0 * z, -60.0, 60.0)),
+    'gauss': lambda z: np.exp(-5.0 * np.clip(z, -3.4, 3.4) ** 2),
+    'relu': lambda z: np.where(z > 0.0, z, 0.0),
+    'softplus': lambda z: 0.2 * np.log(1 + np.exp(np.clip(5.0 * z, -60.0, 60.0))),
+    'identity': lambda z: z,
+    'clamped': lambda z: np.clip(z, -1.0, 1.0),
+    'inv': lambda z: np.divide(1.0, z, out=np.zeros_like(z), where=z != 0.0),
+    'log': lambda z: np.log(np.maximum(1e-7, z)),
+    'exp': lambda z: np.exp(np.clip(z, -60.0, 60.0)),
+    'abs': np.abs,
+    'hat': lambda z: np.maximum(0.0, 1 - np.abs(z)),
+    'square': np.square,
+    'cube': lambda z: z ** 3,
+}
+
+
+def compile_genome(genome, config):
+    """
+    Describe a genome's phenotype as plain data:
+    (input keys, output keys, [(node, activation, aggregation, bias, response, [(input, weight), ...]), ...])
+    with nodes in evaluation order. The description pickles small and survives process boundaries.
+    """
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    activation_names = {f: name for name, f in config.genome_config.activation_defs.functions.items()}
+    aggregation_names = {f: name for name, f in config.genome_config.aggregation_function_defs.functions.items()}
+    node_evals = [(node, activation_names[act], aggregation_names[agg], bias, response, list(links))
+                  for node, act, agg, bias, response, links in net.node_evals]
+    return list(net.input_nodes), list(net.output_nodes), node_evals
+
+
+def network_from_spec(spec):
+    """Rebuild a plain neat FeedForwardNetwork from a ``compile_genome`` description."""
+    input_keys, output_keys, node_evals = spec
+    activations = neat.activations.ActivationFunctionSet()
+    aggregations = neat.aggregations.AggregationFunctionSet()
+    node_evals = [(node, activations.get(act), aggregations.get(agg), bias, response, [tuple(link) for link in links])
+                  for node, act, agg, bias, response, links in node_evals]
+    return neat.nn.FeedForwardNetwork(list(input_keys), list(output_keys), node_evals)
+
+
+class BatchNetwork:
+    def __init__(self, specs):
+        """Pack compiled network descriptions (see ``compile_genome``) into padded arrays."""
+        count = len(specs)
+        num_inputs = len(specs[0][0]) if specs else 0
+        num_outputs = len(specs[0][1]) if specs else 0
+        depth = max((len(node_evals) for _, _, node_evals in specs), default=0)
+
+        # Value slots: inputs, then one slot per evaluation step, then an always-zero slot
+        # for outputs that are not connected to anything
+        self.num_inputs = num_inputs
+        self.depth = depth
+        self.slots = num_inputs + depth + 1
+        zero_slot = self.slots - 1
+
+        self.weights = np.zeros((count, depth, self.slots))
+        self.bias = np.zeros((count, depth))
+        self.response = np.zeros((count, depth))
+        self.output_slots = np.full((count, num_outputs), zero_slot, dtype=np.int64)
+        activation_ids = np.zeros((count, depth), dtype=np.int64)
+        self.activation_names = []
+
+        for g, (input_keys, output_keys, node_evals) in enumerate(specs):
+            slot_of = {key: i for i, key in enumerate(input_keys)}
+            for step, (node, act, agg, bias, response, links) in enumerate(node_evals):
+                if agg != 'sum':
+                    raise ValueError(f"Batched inference only supports sum aggregation, got {agg!r}")
+                if act not in ACTIVATIONS:
+                    raise ValueError(f"No batched version of activation function {act!r}")
+                if act not in self.activation_names:
+                    self.activation_names.append(act)
+                for key, weight in links:
+                    self.weights[g, step, slot_of[key]] += weight
+                self.bias[g, step] = bias
+                self.response[g, step] = response
+                activation_ids[g, step] = self.activation_names.index(act)
+                slot_of[node] = num_inputs + step
+            for o, key in enumerate(output_keys):
+                if key in slot_of:
+                    self.output_slots[g, o] = slot_of[key]
+
+        # Padding steps keep activation 0 and zero weights; nothing reads their slots
+        self.activation_ids = activation_ids
+        self.uniform_activation = len(self.activation_names) <= 1
+
+    @classmethod
+    def from_genomes(cls, genomes, config):
+        return cls([compile_genome(g, config) for g in genomes])
+
+    def activate(self, inputs, rows=None):
+        """
+        Activate the networks at ``rows`` (all networks if None) on an (M, inputs) batch,
+        one row of inputs per network. Returns an (M, outputs) array.
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if rows is None:
+            rows = np.arange(len(self.weights))
+        rows = np.asarray(rows, dtype=np.int64)
+
+        values = np.zeros((len(rows), self.slots))
+        values[:, :self.num_inputs] = inputs
+        weights = self.weights[rows]
+        bias = self.bias[rows]
+        response = self.response[rows]
+        if self.uniform_activation and self.activation_names:
+            activation = ACTIVATIONS[self.activation_names[0]]
+        else:
+            activation_ids = self.activation_ids[rows]
+
+        for step in range(self.depth):
+            z = bias[:, step] + response[:, step] * np.einsum('ms,ms->m', values, weights[:, step])
+            if self.uniform_activation:
+                values[:, self.num_inputs + step] = activation(z)
+            else:
+                out = np.empty_like(z)
+                for a, name in enumerate(self.activation_names):
+                    mask = activation_ids[:, step] == a
+                    out[mask] = ACTIVATIONS[name](z[mask])
+                values[:, self.num_inputs + step] = out
+
+        return values[np.arange(len(rows))[:, None], self.output_slots[rows]]
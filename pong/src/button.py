@@ -1,6 +1,7 @@
 import pygame
 import math
 from .config import WHITE, BLACK, HIGHLIGHT, WIDTH, HEIGHT
+from .text import render_text
 
 class Button:
     def __init__(self, center_x, center_y, min_width, min_height, text, font, color=WHITE, hover_color=HIGHLIGHT):
@@ -15,10 +16,8 @@ class Button:
         self.original_font_size = font.get_height()
         self.current_font = font
         
-        # Calculate initial size based on text
-        text_surface = self.font.render(text, True, WHITE)
-        text_width = text_surface.get_width()
-        text_height = text_surface.get_height()
+        # Calculate initial size based on text, measured without rendering it
+        text_width, text_height = self.font.size(text)
         
         # Set button size with padding
         self.width = max(min_width, text_width + 40)
@@ -31,6 +30,8 @@ class Button:
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.center = (center_x, center_y)
         self.original_rect = self.rect.copy()
+        self._surfaces_key = None
+        self._surfaces = {}
 
     def draw(self, screen):
         # Animate button position with smooth floating
@@ -39,36 +40,64 @@ class Button:
         if self.animation_offset >= 2 * math.pi:
             self.animation_offset = 0
 
-        color = self.hover_color if self.is_hovered else self.color
+        screen.blit(self.state_surface(), self.rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def state_surface(self):
+        """The composited button for its current state, rendered once per state."""
+        # Pre-rendered states are only valid for the text, fonts and colors they were drawn with
+        key = (self.text, self.font, self.current_font, self.color, self.hover_color)
+        if key != self._surfaces_key:
+            self._surfaces_key = key
+            self._surfaces = {}
+        surface = self._surfaces.get(self.is_hovered)
+        if surface is None:
+            surface = self._render(self.hover_color if self.is_hovered else self.color)
+            self._surfaces[self.is_hovered] = surface
+        return surface
+
+    def _render(self, color):
+        # Layers are composited premultiplied, so blending the result onto the screen matches
+        # blending each layer onto the screen in turn
+        width, height = self.rect.size
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
         shadow_offset_x = 6
         shadow_offset_y = 6
         r = self.radius
 
         # --- Draw shadow as a rounded rectangle, only to the right and down, never on the left/top ---
-        shadow_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        shadow_rect = pygame.Rect(shadow_offset_x, shadow_offset_y, self.rect.width - shadow_offset_x, self.rect.height - shadow_offset_y)
+        shadow_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        shadow_rect = pygame.Rect(shadow_offset_x, shadow_offset_y, width - shadow_offset_x, height - shadow_offset_y)
         pygame.draw.rect(shadow_surface, (*BLACK, 80), shadow_rect, border_radius=r)
-        screen.blit(shadow_surface, self.rect)
+        surface.blit(shadow_surface.premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
 
         # --- Draw button background as a rounded rectangle ---
-        button_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        for i in range(self.rect.height):
-            alpha = int(255 * (1 - abs(i - self.rect.height/2) / (self.rect.height/2)))
-            pygame.draw.line(button_surface, (*color, alpha), (0, i), (self.rect.width, i))
-        pygame.draw.rect(button_surface, color, (0, 0, self.rect.width, self.rect.height), border_radius=r)
-        screen.blit(button_surface, self.rect)
+        button_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for i in range(height):
+            alpha = int(255 * (1 - abs(i - height/2) / (height/2)))
+            pygame.draw.line(button_surface, (*color, alpha), (0, i), (width, i))
+        pygame.draw.rect(button_surface, color, (0, 0, width, height), border_radius=r)
+        surface.blit(button_surface.premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
 
         # --- Draw border as a rounded rectangle ---
-        pygame.draw.rect(screen, color, self.rect, 2, border_radius=r)
+        pygame.draw.rect(surface, color, (0, 0, width, height), 2, border_radius=r)
 
         # --- Draw text ---
-        text_surface = self.current_font.render(self.text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        # Draw text with shadow
-        shadow_surface = self.font.render(self.text, True, BLACK)
+        text_surface = render_text(self.current_font, self.text, WHITE)
+        text_rect = text_surface.get_rect(center=(width // 2, height // 2))
+        # Draw text with shadow. Font surfaces have padded rows, which premul_alpha() gets wrong,
+        # so they are copied into plain surfaces first
+        shadow_surface = render_text(self.font, self.text, BLACK)
         shadow_rect = shadow_surface.get_rect(center=(text_rect.centerx + 2, text_rect.centery + 2))
-        screen.blit(shadow_surface, shadow_rect)
-        screen.blit(text_surface, text_rect)
+        surface.blit(shadow_surface.copy().premul_alpha(), shadow_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+        surface.blit(text_surface.copy().premul_alpha(), text_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def dirty_rect(self):
+        """Area the button may cover while it floats up and down."""
+        return self.original_rect.inflate(0, 8)
 
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
@@ -0,0 +1,193 @@
+"""
+Training checkpoints written on a background thread, with a retention policy and resume.
+
+neat's Checkpointer gzips a pickle of the config, the population and the species set (and with it
+every reporter, so the statistics history grows into each file) on the training thread. Here the
+training thread only pickles what evolution needs to go on: genomes, species, the next genome and
+species keys, the best genome and the random state. A writer thread compresses and writes the
+snapshot under a temporary name and renames it, so a crash never leaves a half-written checkpoint
+under a real name, then deletes the checkpoints the retention policy no longer keeps.
+
+Every run writes into its own ``run-*`` directory below the checkpoint directory, so retention
+never touches another run's files; a resumed run carries on in the directory it resumed from.
+"""
+import os
+import re
+import time
+import zlib
+import queue
+import atexit
+import pickle
+import random
+import threading
+from itertools import count
+import neat
+from neat.reporting import BaseReporter
+
+MAGIC = b'PONG-CHECKPOINT-1\n'
+FILENAME = 'gen-{:06d}.ckpt'
+FILENAME_PATTERN = re.compile(r'gen-(\d+)\.ckpt$')
+RUN_PREFIX = 'run-'
+
+
+def _next_key(owner, name):
+    # Read the next value of an itertools.count attribute without using it up
+    value = next(getattr(owner, name))
+    setattr(owner, name, count(value))
+    return value
+
+
+def checkpoint_files(directory):
+    """(generation, path) of every checkpoint in ``directory``, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    for name in os.listdir(directory):
+        match = FILENAME_PATTERN.match(name)
+        if match:
+            files.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(files, reverse=True)
+
+
+def retained(generations, keep_last, keep_every):
+    """The generations a retention policy keeps: the newest ``keep_last`` and every ``keep_every``-th."""
+    generations = sorted(generations)
+    keep = set(generations[-keep_last:]) if keep_last > 0 else set()
+    if keep_every > 0:
+        keep.update(g for g in generations if g % keep_every == 0)
+    return keep
+
+
+def load_checkpoint(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError("not a checkpoint file")
+    return pickle.loads(zlib.decompress(data[len(MAGIC):]))
+
+
+def new_run_directory(root):
+    """A directory below ``root`` for the checkpoints of a run starting now."""
+    base = os.path.join(root, f"{RUN_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    # Another run of this process may have started within the same second
+    path, suffix = base, count(1)
+    while os.path.exists(path):
+        path = f"{base}-{next(suffix)}"
+    return path
+
+
+def load_latest_checkpoint(root):
+    """
+    The most recently written checkpoint of any run below ``root`` that loads, skipping damaged
+    ones, and the run directory it belongs to; (None, None) if there is none.
+    """
+    if not os.path.isdir(root):
+        return None, None
+    runs = [os.path.join(root, name) for name in os.listdir(root) if name.startswith(RUN_PREFIX)]
+    files = [(os.path.getmtime(path), directory, path) for directory in runs for _, path in checkpoint_files(directory)]
+    for _, directory, path in sorted(files, reverse=True):
+        try:
+            return load_checkpoint(path), directory
+        except (OSError, ValueError, EOFError, zlib.error, pickle.UnpicklingError) as e:
+            print(f"Skipping unreadable checkpoint {path}: {e}")
+    return None, None
+
+
+def restore_population(config, state):
+    """A neat.Population continuing from a checkpoint; restores the random state as well."""
+    species_set = config.species_set_type(config.species_set_config, None)
+    population = neat.Population(config, initial_state=(state['population'], species_set, state['generation']))
+    species_set.reporters = population.reporters
+    species_set.species = state['species']
+    species_set.genome_to_species = state['genome_to_species']
+    species_set.indexer = count(state['next_species_key'])
+    population.reproduction.genome_indexer = count(state['next_genome_key'])
+    # Without it new nodes would get keys other genomes already use for different nodes
+    next_node_key = state['next_node_key']
+    config.genome_config.node_indexer = count(next_node_key) if next_node_key is not None else None
+    population.best_genome = state['best_genome']
+    random.setstate(state['random_state'])
+    return population
+
+
+class AsyncCheckpointer(BaseReporter):
+    def __init__(self, directory, interval=1, keep_last=5, keep_every=50):
+        self.directory = directory
+        self.interval = interval
+        self.keep_last = keep_last
+        self.keep_every = keep_every
+        self.population = None
+        self.generation = None
+        # At most two snapshots wait for the writer before training waits for it
+        self.queue = queue.Queue(maxsize=2)
+        self.thread = None
+
+    def attach(self, population):
+        """Add the checkpointer to ``population``, whose key counters and best genome it saves too."""
+        self.population = population
+        population.add_reporter(self)
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def end_generation(self, config, population, species_set):
+        if (self.generation + 1) % self.interval == 0:
+            self.save_checkpoint(config, population, species_set, self.generation)
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        """Snapshot the population reproduced from ``generation`` and queue it for writing."""
+        state = {
+            # The generation the saved population is about to play
+            'generation': generation + 1,
+            'population': population,
+            'species': species_set.species,
+            'genome_to_species': species_set.genome_to_species,
+            'next_species_key': _next_key(species_set, 'indexer'),
+            'next_genome_key': _next_key(self.population.reproduction, 'genome_indexer'),
+            # neat starts counting node keys on the first new node; None until then
+            'next_node_key': (_next_key(config.genome_config, 'node_indexer')
+                              if config.genome_config.node_indexer is not None else None),
+            'best_genome': self.population.best_genome,
+            'random_state': random.getstate(),
+        }
+        # Pickled here, so evolution can carry on changing the genomes while the writer works
+        data = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        if self.thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.thread.start()
+            # Leaving training with ESC exits the process; finish the queued writes first
+            atexit.register(self.close)
+        self.queue.put((generation + 1, data))
+
+    def _write_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            generation, data = item
+            path = os.path.join(self.directory, FILENAME.format(generation))
+            try:
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(MAGIC)
+                    # The fastest zlib level; higher ones save little on pickled genomes
+                    f.write(zlib.compress(data, 1))
+                os.replace(path + '.tmp', path)
+                self.prune()
+            except OSError as e:
+                print(f"Could not write checkpoint {path}: {e}")
+
+    def prune(self):
+        """Delete the checkpoints the retention policy does not keep."""
+        files = checkpoint_files(self.directory)
+        keep = retained([generation for generation, _ in files], self.keep_last, self.keep_every)
+        for generation, path in files:
+            if generation not in keep:
+                os.remove(path)
+
+    def close(self):
+        """Wait for the queued checkpoints to be written."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
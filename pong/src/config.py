@@ -1,24 +1,69 @@
-import pygame
-
-# Initialize Pygame with AVX2 support
-import os
-os.environ['PYGAME_DETECT_AVX2'] = '1'
-os.environ['SDL_VIDEODRIVER'] = 'x11'  # Use X11 video driver instead of GTK
-pygame.init()
+# Plain constants only: the headless simulation imports this module, so it must not
+# depend on pygame (see display.init_pygame for the SDL set-up)
 
 # Window dimensions
 WIDTH, HEIGHT = 800, 600
 
+# Frame and simulation rates. Speeds below are distances per 1/SPEED_RATE s. The game simulates
+# in fixed steps of 1/SIMULATION_RATE s and, after a slow frame, catches up by at most
+# MAX_CATCH_UP_STEPS steps
+SPEED_RATE = 60
+FRAME_RATE = 60
+SIMULATION_RATE = 120
+MAX_CATCH_UP_STEPS = 8
+
 # Paddle settings
 PADDLE_WIDTH, PADDLE_HEIGHT = 15, 100
 PADDLE_SPEED = 8
 
+# AI trainer paddle dynamics (velocity based instead of fixed steps)
+AI_PADDLE_SPEED = PADDLE_SPEED * 2
+AI_PADDLE_ACCELERATION = 1.2
+AI_PADDLE_FRICTION = 0.9
+
 # Ball settings
 BALL_SIZE = 15
 BALL_SPEED = 6
 MAX_BALL_SPEED = 10
 SPEED_INCREASE = 0.05
 
+# Most pre-rendered paddle sprites (glow, body and hit flash surfaces) kept at once
+PADDLE_SPRITE_CACHE_SIZE = 1024
+
+# Most pre-rendered ball sprites (trail steps, body and hit glow stages) kept at once
+BALL_SPRITE_CACHE_SIZE = 4096
+
+# Most simulation ticks the training window runs between two drawn frames
+TURBO_MAX_TICKS_PER_FRAME = 4096
+
+# Channel levels of the training window's genome color palette (levels cubed colors)
+TRAINER_COLOR_LEVELS = (100, 152, 204, 255)
+
+# Frame profiler: frames in the rolling p50/p99 window, frames kept for export, and frames
+# between overlay refreshes
+PROFILER_WINDOW = 240
+PROFILER_TRACE_FRAMES = 3600
+PROFILER_OVERLAY_INTERVAL = 15
+
+# Most rendered text surfaces (scores, labels, button captions, titles) kept at once
+TEXT_CACHE_SIZE = 256
+
+# Dirty-rect rendering pushes a full frame instead once changed regions exceed this share of the screen
+DIRTY_RECT_FULL_FLIP_FRACTION = 0.5
+
+# Particle effects: most live particles per system, fade steps and cached circle sprites
+PARTICLE_CAPACITY = 1024
+PARTICLE_ALPHA_LEVELS = 16
+PARTICLE_SPRITE_CACHE_SIZE = 512
+
+# Ice particles drifting over the background. Sprites are cached per size step (pixels),
+# rotation step (out of 90 degrees, the diamond's symmetry) and alpha step
+ICE_PARTICLE_COUNT = 30
+ICE_SIZE_STEP = 0.25
+ICE_ROTATION_STEPS = 16
+ICE_ALPHA_STEP = 10
+ICE_SPRITE_CACHE_SIZE = 2048
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -40,6 +85,8 @@ GRADIENT_SPEED = 0.5
 CENTER_LINE_DASH_LENGTH = 20
 CENTER_LINE_GAP = 10
 CENTER_LINE_SPEED = 2
+# Stars twinkle in this many groups, each sharing one random brightness per frame
+STAR_TWINKLE_GROUPS = 4
 
 # Game states
 MENU = 0
@@ -0,0 +1,70 @@
+"""
+Dirty-rectangle presentation. The scene is still drawn in full into the display surface, but
+only the regions that changed are pushed to the window with ``pygame.display.update(rects)``.
+"""
+import pygame
+from .config import DIRTY_RECT_FULL_FLIP_FRACTION
+
+
+class DirtyRectRenderer:
+    """
+    Collects the rectangles that changed this frame and pushes them together with last frame's,
+    so whatever moved is both drawn at its new place and erased from its old one. When the
+    rectangles cover more than ``full_flip_fraction`` of the screen a plain flip is cheaper.
+    """
+    def __init__(self, surface, full_flip_fraction=DIRTY_RECT_FULL_FLIP_FRACTION):
+        self.screen_rect = surface.get_rect()
+        self.full_flip_fraction = full_flip_fraction
+        self._rects = []
+        self._in_place = []
+        self._previous = []
+        self._full = True
+
+        # Pixels pushed to the window in total, see average_pushed_pixels
+        self.total_pushed_pixels = 0
+        self.frames = 0
+
+    def add(self, *rects):
+        """Mark regions as changed this frame; ``None`` entries are ignored."""
+        for rect in rects:
+            if rect is not None:
+                self._rects.append(rect)
+
+    def add_in_place(self, *rects):
+        """
+        Mark regions redrawn in place this frame, like a recolored background: nothing moved out
+        of them, so unlike ``add`` they are not pushed again next frame.
+        """
+        self._in_place.extend(rects)
+
+    def invalidate(self):
+        """Push the whole screen on the next frame, e.g. after switching screens."""
+        self._full = True
+
+    def _clip(self, rects):
+        return [clipped for clipped in (self.screen_rect.clip(rect) for rect in rects) if clipped.width and clipped.height]
+
+    def present(self):
+        current = self._clip(self._rects)
+        # Identical rects, like a button drawn in the same place both frames, are pushed once
+        rects = list({tuple(rect): rect for rect in self._previous + current + self._clip(self._in_place)}.values())
+        # Other overlapping rects are counted once for each rect they are part of
+        area = sum(rect.width * rect.height for rect in rects)
+        full_area = self.screen_rect.width * self.screen_rect.height
+
+        if self._full or area > full_area * self.full_flip_fraction:
+            pygame.display.flip()
+            self.total_pushed_pixels += full_area
+        else:
+            pygame.display.update(rects)
+            self.total_pushed_pixels += area
+
+        self.frames += 1
+        self._previous = current
+        self._rects = []
+        self._in_place = []
+        self._full = False
+
+    def average_pushed_pixels(self):
+        """Pixels pushed to the window per frame; the benchmark reports it as a share of the screen."""
+        return self.total_pushed_pixels / self.frames if self.frames else 0.0
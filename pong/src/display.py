@@ -0,0 +1,18 @@
+"""
+SDL set-up for the windowed parts of the game: the menu, the match and the training window.
+
+The simulation modules never import pygame, so headless training and evaluation workers start
+without touching SDL; only code that opens a window calls ``init_pygame``. Only the display and
+font modules are initialised, the game has no use for audio or joysticks.
+"""
+import os
+import pygame
+
+
+def init_pygame():
+    # Initialize Pygame with AVX2 support
+    os.environ['PYGAME_DETECT_AVX2'] = '1'
+    # Use X11 video driver instead of GTK, unless a driver was chosen explicitly (e.g. dummy)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'x11')
+    pygame.display.init()
+    pygame.font.init()
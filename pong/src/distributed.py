@@ -0,0 +1,262 @@
+"""
+Distributed genome evaluation over TCP.
+
+The coordinator lives inside AITrainer and hands out batches of compiled network descriptions
+(see ``compile_genome``); any number of headless workers connect to it, play the episodes and
+send back fitness values. Messages are length-prefixed JSON, so a worker never unpickles data
+from the network. With evaluation stages the coordinator picks the genomes that go on to the next
+stage across all batches and sends only those out again, to be replayed up to the next budget.
+
+Workers send heartbeats while they compute. A worker that disconnects, stays silent for longer
+than the heartbeat timeout or sends a malformed result loses its batch, which goes back into the
+queue for another worker.
+"""
+import os
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+from itertools import count
+import numpy as np
+from .batch_network import compile_genome
+from .evaluation import merge_plays, play_in_stages, play_specs
+from .vector_engine import derive_seeds
+
+HEADER = struct.Struct('>I')
+HEARTBEAT_INTERVAL = 1.0
+
+
+def check_result(message, batch):
+    """
+    The fitness values, still-playing flags, ticks and activations of a worker's result for
+    ``batch``; ValueError if any of them is missing or does not fit the batch.
+    """
+    try:
+        fitness, playing = message['fitness'], message['playing']
+        ticks, activations = message['ticks'], message['activations']
+    except KeyError as e:
+        raise ValueError(f"result without {e.args[0]!r}") from None
+    count = len(batch['specs'])
+    if not (isinstance(fitness, list) and isinstance(playing, list) and len(fitness) == len(playing) == count):
+        raise ValueError(f"result does not have fitness and playing lists for {count} genomes")
+    if not (isinstance(ticks, int) and isinstance(activations, int)):
+        raise ValueError("result ticks and activations are not integers")
+    return fitness, playing, ticks, activations
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return bytes(data)
+
+
+def recv_message(sock):
+    size, = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class WorkerStats:
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.genomes = 0
+        self.busy_seconds = 0.0
+        self.lost_batches = 0
+        self.connected = True
+
+    def genomes_per_second(self):
+        return self.genomes / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+    def __str__(self):
+        state = "" if self.connected else " (disconnected)"
+        return (f"{self.name}{state}: {self.batches} batches, {self.genomes} genomes, "
+                f"{self.genomes_per_second():.1f} genomes/s, {self.lost_batches} lost")
+
+
+class EvaluationCoordinator:
+    def __init__(self, host='127.0.0.1', port=5555, batch_size=25, heartbeat_timeout=10.0, seed=0, episode=None,
+                 stages=None):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.heartbeat_timeout = heartbeat_timeout
+        self.seed = seed
+        self.episode = episode or {}
+        self.stages = stages or {}
+        # Numbers the plays, so batches of different stages get different ids
+        self._plays = count()
+        self.workers = 0
+        self.stats = []
+        self._pending = queue.Queue()
+        self._results = {}
+        self._done = threading.Condition()
+        self._closed = threading.Event()
+        self._server = None
+        self._threads = []
+
+    def start(self):
+        self._server = socket.create_server((self.host, self.port))
+        # Pick up the real port when an ephemeral one (0) was requested
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while not self._closed.is_set():
+            try:
+                conn, address = self._server.accept()
+            except OSError:
+                break
+            thread = threading.Thread(target=self._serve, args=(conn, address), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _serve(self, conn, address):
+        batch = None
+        stats = None
+        try:
+            conn.settimeout(self.heartbeat_timeout)
+            hello = recv_message(conn)
+            stats = WorkerStats(hello.get('name') or f"{address[0]}:{address[1]}")
+            with self._done:
+                self.stats.append(stats)
+                self.workers += 1
+
+            while not self._closed.is_set():
+                try:
+                    batch = self._pending.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                started = time.perf_counter()
+                send_message(conn, {'type': 'batch', **batch})
+                while True:
+                    # Times out (and drops the worker) if not even a heartbeat arrives
+                    message = recv_message(conn)
+                    if message['type'] == 'result' and message['id'] == batch['id']:
+                        break
+                result = check_result(message, batch)
+                stats.batches += 1
+                stats.genomes += len(batch['specs'])
+                stats.busy_seconds += time.perf_counter() - started
+                with self._done:
+                    self._results[batch['id']] = result
+                    self._done.notify_all()
+                batch = None
+
+            send_message(conn, {'type': 'shutdown'})
+        except OSError:
+            pass
+        except ValueError as e:
+            print(f"Dropping worker {stats.name if stats is not None else address}: {e}")
+        finally:
+            if batch is not None:
+                # Re-queue the work this worker took with it
+                self._pending.put(batch)
+                if stats is not None:
+                    stats.lost_batches += 1
+            if stats is not None:
+                stats.connected = False
+                with self._done:
+                    self.workers -= 1
+            conn.close()
+
+    def evaluate(self, genomes, config, generation, seeds=None):
+        """
+        Assign a fitness to every (genome_id, genome) pair using the connected workers, with
+        episode seeds derived from the generation and genome keys unless given. Returns the
+        simulated world ticks and network activations the workers reported, and the keys of the
+        genomes an evaluation stage stopped early.
+        """
+        if self._server is None:
+            self.start()
+            print(f"Waiting for evaluation workers on {self.host}:{self.port}")
+
+        if seeds is None:
+            seeds = derive_seeds(self.seed, generation, [genome_id for genome_id, _ in genomes])
+        seeds = seeds.tolist()
+        specs = [compile_genome(g, config) for _, g in genomes]
+
+        def play(indices, max_ticks):
+            play_id = next(self._plays)
+            batch_ids = []
+            for start in range(0, len(indices), self.batch_size):
+                batch = indices[start:start + self.batch_size]
+                batch_id = f"{generation}-{play_id}-{start}"
+                batch_ids.append(batch_id)
+                self._pending.put({'id': batch_id,
+                                   'specs': [specs[i] for i in batch],
+                                   'seeds': [seeds[i] for i in batch],
+                                   'max_ticks': max_ticks,
+                                   'episode': self.episode})
+            with self._done:
+                self._done.wait_for(lambda: all(b in self._results for b in batch_ids))
+                return merge_plays([self._results.pop(b) for b in batch_ids])
+
+        fitness, eliminated, ticks, activations = play_in_stages(play, len(specs), **self.stages)
+        for (_, g), f in zip(genomes, fitness):
+            g.fitness = f
+        for stats in self.stats:
+            print(stats)
+        return ticks, activations, [genomes[i][0] for i in eliminated]
+
+    def close(self):
+        self._closed.set()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # Give the connection threads a moment to send their shutdown messages
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+
+def run_worker(host='127.0.0.1', port=5555, name=None, retry_seconds=2.0):
+    """Connect to a coordinator and evaluate batches until it shuts down."""
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            print(f"Coordinator {host}:{port} not reachable, retrying in {retry_seconds:.0f}s")
+            time.sleep(retry_seconds)
+
+    send_lock = threading.Lock()
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                with send_lock:
+                    send_message(sock, {'type': 'heartbeat'})
+            except OSError:
+                break
+
+    with send_lock:
+        send_message(sock, {'type': 'hello', 'name': name or f"{socket.gethostname()}-{os.getpid()}"})
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    try:
+        while True:
+            message = recv_message(sock)
+            if message['type'] == 'shutdown':
+                break
+            seeds = np.array(message['seeds'], dtype=np.uint64)
+            fitness, playing, ticks, activations = play_specs(message['specs'], seeds, message.get('max_ticks'),
+                                                              **message['episode'])
+            with send_lock:
+                send_message(sock, {'type': 'result', 'id': message['id'], 'fitness': fitness,
+                                    'playing': playing, 'ticks': ticks, 'activations': activations})
+    except (OSError, ValueError):
+        pass
+    finally:
+        stop.set()
+        sock.close()
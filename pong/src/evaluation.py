@@ -0,0 +1,230 @@
+"""
+Headless fitness evaluation for NEAT genomes, optionally sharded across a process pool.
+
+Workers only receive compiled network descriptions and per-genome seeds, and only send back
+fitness values, so they never touch pygame display state. Each genome's episode depends on its
+own seed alone, which makes the results identical for any number of workers.
+
+With evaluation stages (successive halving) every episode first plays up to the first stage's
+tick budget; only the fittest ``stage_keep`` of all the genomes still playing continue their
+episode up to the next budget, and the others keep the fitness earned so far. Fitness is reward
+summed over the ticks played, so stopped and continued genomes stay on one scale. The fittest are
+picked across the whole evaluation, not per shard or batch: pool and remote workers play the
+survivors again from their seed up to the next budget, which replays the same episode.
+"""
+import os
+import math
+import hashlib
+import multiprocessing
+import numpy as np
+from .batch_network import BatchNetwork, compile_genome, network_from_spec
+from .event_sim import EventPongSimulator
+from .lru import LRUCache
+from .vector_engine import VectorPongEngine, derive_seeds
+
+
+def stage_losers(playing, fitness, keep):
+    """The worlds in ``playing`` outside the fittest ``keep`` fraction of them (at least one stays)."""
+    count = max(1, math.ceil(len(playing) * keep))
+    order = np.argsort(-fitness[playing], kind='stable')
+    return playing[order[count:]]
+
+
+class Episodes:
+    """
+    One headless episode per compiled network, played on in steps: all at once in VectorPongEngine
+    or one world at a time with the event-driven simulator.
+    """
+    def __init__(self, specs, seeds, max_hits=None, engine='vector', decision_interval=1):
+        self.engine = engine
+        if engine == 'event':
+            self.nets = [network_from_spec(spec) for spec in specs]
+            self.simulators = [EventPongSimulator(seed, max_hits, decision_interval) for seed in seeds]
+        elif engine == 'vector':
+            self.nets = BatchNetwork(specs)
+            self.worlds = VectorPongEngine(len(specs), seeds, max_hits=max_hits)
+        else:
+            raise ValueError(f"Unknown simulation engine {engine!r}")
+
+    def play(self, indices, max_ticks=None):
+        """
+        Play the episodes at ``indices`` on until they end or reach ``max_ticks`` ticks; the others
+        are not played any further. Returns their fitness values, whether each is still playing,
+        the simulated world ticks and the network activations (one per network per decision).
+        """
+        if self.engine == 'event':
+            simulators = [self.simulators[i] for i in indices]
+            ticks = sum(simulator.ticks for simulator in simulators)
+            activations = sum(simulator.decisions for simulator in simulators)
+            for i, simulator in zip(indices, simulators):
+                net = self.nets[i]
+                simulator.run(lambda side, inputs: net.activate(inputs), max_ticks)
+            return ([simulator.fitness for simulator in simulators], [simulator.alive for simulator in simulators],
+                    sum(simulator.ticks for simulator in simulators) - ticks,
+                    sum(simulator.decisions for simulator in simulators) - activations)
+
+        worlds = self.worlds
+        worlds.stop(np.setdiff1d(np.flatnonzero(worlds.alive), indices))
+        activations = 0
+
+        def policy(side, index, inputs):
+            nonlocal activations
+            activations += len(index)
+            return self.nets.activate(inputs, index)
+
+        ticks = 0
+        alive = worlds.alive_count()
+        while alive > 0 and (max_ticks is None or worlds.ticks < max_ticks):
+            ticks += alive
+            worlds.step(policy)
+            alive = worlds.alive_count()
+        return worlds.fitness[indices].tolist(), worlds.alive[indices].tolist(), ticks, activations
+
+
+def play_specs(specs, seeds, max_ticks=None, **episode):
+    """Play one episode per compiled network up to ``max_ticks``; returns what Episodes.play does."""
+    return Episodes(specs, seeds, **episode).play(np.arange(len(specs)), max_ticks)
+
+
+def merge_plays(results):
+    """Join the results of plays of consecutive parts of the episodes into one."""
+    return ([f for result in results for f in result[0]], [p for result in results for p in result[1]],
+            sum(result[2] for result in results), sum(result[3] for result in results))
+
+
+def play_in_stages(play, count, stage_ticks=(), stage_keep=0.25):
+    """
+    Play ``count`` episodes in evaluation stages, with ``play(indices, max_ticks)`` returning what
+    Episodes.play does. Returns every episode's fitness, the indices of those a stage stopped before
+    they ended, the simulated world ticks and the network activations.
+    """
+    fitness = np.zeros(count)
+    playing = np.arange(count)
+    eliminated = []
+    ticks = activations = 0
+    # Without stages, a single one that lasts until every episode has ended
+    budgets = list(stage_ticks) or [None]
+    for stage, budget in enumerate(budgets):
+        if not len(playing):
+            break
+        played, still_playing, played_ticks, played_activations = play(playing, budget)
+        fitness[playing] = played
+        ticks += played_ticks
+        activations += played_activations
+        playing = playing[np.asarray(still_playing, dtype=bool)]
+        if stage + 1 < len(budgets) and len(playing):
+            losers = stage_losers(playing, fitness, stage_keep)
+            eliminated.extend(losers.tolist())
+            playing = np.setdiff1d(playing, losers)
+    return fitness.tolist(), eliminated, ticks, activations
+
+
+def _play_shard(args):
+    specs, seeds, max_ticks, episode = args
+    return play_specs(specs, seeds, max_ticks, **episode)
+
+
+class GenomeEvaluator:
+    def __init__(self, workers=1, seed=0, episode=None, stages=None):
+        self.workers = workers if workers > 0 else os.cpu_count() or 1
+        self.seed = seed
+        # Keyword arguments for Episodes: max_hits, engine, decision_interval
+        self.episode = episode or {}
+        # Keyword arguments for play_in_stages: stage_ticks, stage_keep
+        self.stages = stages or {}
+        self.pool = None
+
+    def evaluate(self, genomes, config, generation, seeds=None):
+        """
+        Assign a fitness to every (genome_id, genome) pair. Episode seeds are derived from the
+        generation and genome keys unless given. Returns the simulated world ticks and network
+        activations it took, and the keys of the genomes an evaluation stage stopped early.
+        """
+        if seeds is None:
+            seeds = derive_seeds(self.seed, generation, [genome_id for genome_id, _ in genomes])
+        specs = [compile_genome(g, config) for _, g in genomes]
+
+        if self.workers == 1 or len(specs) < 2:
+            play = Episodes(specs, seeds, **self.episode).play
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.workers)
+
+            def play(indices, max_ticks):
+                # Several shards per worker so long episodes do not leave cores idle
+                shards = np.array_split(indices, min(len(indices), self.workers * 4))
+                jobs = [([specs[i] for i in shard], seeds[shard], max_ticks, self.episode) for shard in shards]
+                return merge_plays(self.pool.map(_play_shard, jobs))
+
+        fitness, eliminated, ticks, activations = play_in_stages(play, len(specs), **self.stages)
+        for (_, g), f in zip(genomes, fitness):
+            g.fitness = f
+        return ticks, activations, [genomes[i][0] for i in eliminated]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+def genome_hash(genome):
+    """64-bit hash of a genome's nodes, connections and weights; identical genomes hash equally."""
+    h = hashlib.blake2b(digest_size=8)
+    for key, node in sorted(genome.nodes.items()):
+        h.update(repr((key, node.bias, node.response, node.activation, node.aggregation)).encode())
+    for key, conn in sorted(genome.connections.items()):
+        h.update(repr((key, conn.weight, conn.enabled)).encode())
+    return int.from_bytes(h.digest(), 'little')
+
+
+class FitnessCache:
+    """
+    Fitness of genomes that were already played, keyed by genome_hash with LRU eviction.
+
+    Episode seeds come from the hash instead of the generation and genome key, so an unchanged
+    genome (an elite, or a child identical to its parent) would play exactly the same episode
+    again; the cache hands out its fitness instead, without compiling or simulating it. Genomes an
+    evaluation stage stopped early are not cached, since whether they went on depended on the
+    genomes they were played with.
+    """
+    def __init__(self, maxsize, seed=0):
+        self.entries = LRUCache(maxsize)
+        self.seed = seed
+        # Genomes whose fitness came from the cache, and genomes that were played
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, evaluator, genomes, config, generation):
+        """
+        Assign a fitness to every (genome_id, genome) pair, playing only new genomes with
+        ``evaluator``. Returns what the evaluator does for the genomes it played.
+        """
+        hashes = [genome_hash(g) for _, g in genomes]
+        fitness = {}
+        new = {}
+        for h, pair in zip(hashes, genomes):
+            if h in fitness or h in new:
+                continue
+            cached = self.entries.get(h)
+            if cached is None:
+                new[h] = pair
+            else:
+                fitness[h] = cached
+
+        ticks = activations = 0
+        eliminated = []
+        if new:
+            seeds = derive_seeds(self.seed, 0, list(new))
+            ticks, activations, eliminated = evaluator.evaluate(list(new.values()), config, generation, seeds)
+            stopped = set(eliminated)
+            for h, (genome_id, g) in new.items():
+                fitness[h] = g.fitness
+                if genome_id not in stopped:
+                    self.entries.put(h, g.fitness)
+
+        for h, (_, g) in zip(hashes, genomes):
+            g.fitness = fitness[h]
+        self.hits += len(genomes) - len(new)
+        self.misses += len(new)
+        return ticks, activations, eliminated
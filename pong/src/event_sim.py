@@ -0,0 +1,179 @@
+"""
+Event-driven headless Pong for a single world.
+
+Between bounces the ball moves in a straight line, so instead of checking walls and paddles
+every tick the simulator computes how many ticks can pass before the next wall hit, paddle-plane
+crossing or score, and jumps straight there. Only the paddle the ball is heading for is integrated
+tick by tick, because its controller needs to see it; the other paddle just coasts and is advanced
+in closed form once its velocity can no longer move it.
+
+With ``decision_interval=1`` the rules are exactly those of VectorPongEngine (fitness may differ
+in the last bits because survival rewards are added in bulk). Larger intervals repeat each
+controller decision for that many ticks, so controller calls scale with rallies rather than frames.
+"""
+import math
+import numpy as np
+from .config import WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_SIZE, BALL_SPEED, AI_PADDLE_FRICTION
+from .physics import LEFT, RIGHT, PADDLE_X, ball_touches_paddle, bounce_off_paddle, bounce_off_walls
+from .physics import predict_impact_y, move_velocity_paddle, steer_velocity_paddle
+from .vector_engine import TICK_REWARD, HIT_REWARD, MISS_PENALTY, hash_uniform
+
+# Ball rect x positions at which a paddle can possibly be touched
+COLLISION_X = ((PADDLE_X[LEFT] - BALL_SIZE + 1, PADDLE_X[LEFT] + PADDLE_WIDTH - 1),
+               (PADDLE_X[RIGHT] - BALL_SIZE + 1, PADDLE_X[RIGHT] + PADDLE_WIDTH - 1))
+
+# Ticks of ball flight planned at once; longer quiet stretches just take another lookahead
+LOOKAHEAD = 256
+
+
+class EventPongSimulator:
+    def __init__(self, seed, max_hits=None, decision_interval=1):
+        self.seed = np.uint64(seed)
+        self.draws = 0
+        self.max_hits = max_hits
+        self.decision_interval = decision_interval
+
+        self.ball_x = float(WIDTH // 2)
+        self.ball_y = float(HEIGHT // 2)
+        self.rect_x = WIDTH // 2
+        self.rect_y = HEIGHT // 2
+        self.ball_dx = BALL_SPEED * (-1.0 if self._uniform() < 0.5 else 1.0)
+        self.ball_dy = BALL_SPEED * (-1.0 if self._uniform() < 0.5 else 1.0)
+        self.ball_speed = float(BALL_SPEED)
+
+        self.paddle_y = [float(HEIGHT // 2 - PADDLE_HEIGHT // 2)] * 2
+        self.paddle_vel = [0.0, 0.0]
+        # Last controller outputs per side and ticks left before the controller is asked again
+        self.held_outputs = [None, None]
+        self.hold_ticks = [0, 0]
+
+        self.fitness = 0.0
+        self.hits = 0
+        self.alive = True
+        self.ticks = 0
+        self.events = 0
+        self.decisions = 0
+
+    def _uniform(self):
+        value = float(hash_uniform(self.seed, np.uint64(self.draws)))
+        self.draws += 1
+        return value
+
+    def _approaching(self):
+        return LEFT if self.ball_dx < 0 else RIGHT
+
+    def _move_paddle(self, side):
+        y, vel = move_velocity_paddle(self.paddle_y[side], self.paddle_vel[side])
+        self.paddle_y[side] = float(y)
+        self.paddle_vel[side] = float(vel)
+
+    def _coast(self, side, ticks):
+        """Advance a paddle nobody controls; once |velocity| < 0.5 rounding pins it in place."""
+        while ticks > 0 and abs(self.paddle_vel[side]) >= 0.5:
+            self._move_paddle(side)
+            ticks -= 1
+        if ticks > 0:
+            self.paddle_vel[side] *= AI_PADDLE_FRICTION ** ticks
+
+    def _control(self, side, rect_x, rect_y, controller):
+        if self.hold_ticks[side] <= 0:
+            predicted_y = float(predict_impact_y(side, rect_x, rect_y, self.ball_dx, self.ball_dy))
+            self.held_outputs[side] = controller(side, (self.paddle_y[side], abs(PADDLE_X[side] - rect_x), predicted_y))
+            self.hold_ticks[side] = self.decision_interval
+            self.decisions += 1
+        self.hold_ticks[side] -= 1
+
+        up_out, down_out = self.held_outputs[side][0], self.held_outputs[side][1]
+        self.paddle_vel[side] = float(steer_velocity_paddle(self.paddle_vel[side], up_out, down_out))
+
+    def _collide(self, side):
+        paddle_x = PADDLE_X[side]
+        paddle_y = self.paddle_y[side]
+        if not ball_touches_paddle(self.rect_x, self.rect_y, paddle_x, paddle_y):
+            return False
+
+        dx, dy, speed = bounce_off_paddle(self.ball_dx, self.ball_dy, self.ball_speed, self.rect_y, paddle_y,
+                                          self._uniform() - 0.5)
+        self.ball_dx, self.ball_dy, self.ball_speed = float(dx), float(dy), float(speed)
+
+        self.ball_x = float(paddle_x + PADDLE_WIDTH if side == LEFT else paddle_x - BALL_SIZE)
+        self.fitness += HIT_REWARD
+        self.hits += 1
+        # The other paddle is now the one that has to react
+        self.hold_ticks = [0, 0]
+        return True
+
+    def _full_tick(self, controller):
+        """One tick with every check, used whenever something may happen to the ball."""
+        approaching = self._approaching()
+        for side in (LEFT, RIGHT):
+            self.fitness += TICK_REWARD
+            self._move_paddle(side)
+            if side == approaching:
+                self._control(side, self.rect_x, self.rect_y, controller)
+
+        self._collide(LEFT)
+        self._collide(RIGHT)
+
+        self.ball_x += self.ball_dx
+        self.ball_y += self.ball_dy
+        self.rect_x = math.trunc(self.ball_x)
+        self.rect_y = math.trunc(self.ball_y)
+        ball_y, ball_dy = bounce_off_walls(self.ball_y, self.ball_dy, self.rect_y)
+        self.ball_y, self.ball_dy = float(ball_y), float(ball_dy)
+
+        if self.rect_x < 0 or self.rect_x > WIDTH:
+            self.fitness -= MISS_PENALTY
+            self.alive = False
+        if self.max_hits is not None and self.hits >= self.max_hits:
+            self.alive = False
+        self.ticks += 1
+        self.events += 1
+
+    def _plan(self):
+        """
+        Ball positions for the coming ticks and how many of them are quiet: no paddle can be
+        touched at the start of the tick and the move ends clear of walls and the goal lines.
+        """
+        xs = np.cumsum(np.concatenate(([self.ball_x], np.full(LOOKAHEAD, self.ball_dx))))
+        ys = np.cumsum(np.concatenate(([self.ball_y], np.full(LOOKAHEAD, self.ball_dy))))
+        rect_x = np.trunc(xs).astype(np.int64)
+        rect_y = np.trunc(ys).astype(np.int64)
+        rect_x[0], rect_y[0] = self.rect_x, self.rect_y
+
+        touching = np.zeros(LOOKAHEAD + 1, dtype=bool)
+        for low, high in COLLISION_X:
+            touching |= (rect_x >= low) & (rect_x <= high)
+        ends_badly = (rect_y <= 0) | (rect_y + BALL_SIZE >= HEIGHT) | (rect_x < 0) | (rect_x > WIDTH)
+        unsafe = touching[:-1] | ends_badly[1:]
+        quiet = int(np.argmax(unsafe)) if unsafe.any() else LOOKAHEAD
+        return quiet, xs, ys, rect_x, rect_y
+
+    def _quiet_ticks(self, ticks, xs, ys, rect_x, rect_y, controller):
+        """Jump over ticks in which only the approaching paddle can change."""
+        approaching = self._approaching()
+        for k in range(ticks):
+            self._move_paddle(approaching)
+            self._control(approaching, int(rect_x[k]), int(rect_y[k]), controller)
+        self._coast(1 - approaching, ticks)
+
+        self.fitness += 2 * TICK_REWARD * ticks
+        self.ball_x, self.ball_y = float(xs[ticks]), float(ys[ticks])
+        self.rect_x, self.rect_y = int(rect_x[ticks]), int(rect_y[ticks])
+        self.ticks += ticks
+        self.events += 1
+
+    def run(self, controller, max_ticks=None):
+        """
+        Play until the ball is missed, ``max_hits`` is reached or ``max_ticks`` have passed.
+        ``controller(side, inputs)`` returns the two network outputs for one paddle.
+        """
+        while self.alive and (max_ticks is None or self.ticks < max_ticks):
+            quiet, xs, ys, rect_x, rect_y = self._plan()
+            if max_ticks is not None:
+                quiet = min(quiet, max_ticks - self.ticks)
+            if quiet > 0:
+                self._quiet_ticks(quiet, xs, ys, rect_x, rect_y, controller)
+            else:
+                self._full_tick(controller)
+        return self.fitness
@@ -1,89 +1,112 @@
 import pygame
-import random
 import math
-from .config import WHITE, WIDTH, HEIGHT
-
-class IceParticle:
-    def __init__(self):
-        self.reset()
-        self.alpha = random.randint(50, 150)
-        self.size = random.uniform(1, 3)
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-2, 2)
-        self.wobble_offset = random.uniform(0, 2 * math.pi)
-        self.wobble_speed = random.uniform(0.02, 0.05)
-        self.wobble_amount = random.uniform(0.5, 2)
-
-    def reset(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(-100, 0)
-        self.speed = random.uniform(1, 3)
-        self.alpha = random.randint(50, 150)
-        self.size = random.uniform(1, 3)
+import numpy as np
+from .config import WHITE, WIDTH, HEIGHT, ICE_SIZE_STEP, ICE_ROTATION_STEPS, ICE_ALPHA_STEP, ICE_SPRITE_CACHE_SIZE
+from .lru import LRUCache
+
+class IceField:
+    """
+    Falling ice particles stored as NumPy arrays: one vectorised update moves the whole field and
+    drawing is a single ``Surface.blits`` of cached, pre-rotated diamond sprites.
+    """
+    def __init__(self, count, rng=None):
+        self.count = count
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.alpha = np.zeros(count, dtype=np.int64)
+        self.size = np.zeros(count)
+        self.reset(np.arange(count))
+        self.rotation = self.rng.uniform(0, 360, count)
+        self.rotation_speed = self.rng.uniform(-2, 2, count)
+        self.wobble_offset = self.rng.uniform(0, 2 * math.pi, count)
+        self.wobble_speed = self.rng.uniform(0.02, 0.05, count)
+        self.wobble_amount = self.rng.uniform(0.5, 2, count)
+
+    def reset(self, index):
+        """Send the given particles back above the top of the screen."""
+        n = len(index)
+        self.x[index] = self.rng.integers(0, WIDTH, n, endpoint=True)
+        self.y[index] = self.rng.integers(-100, 0, n, endpoint=True)
+        self.speed[index] = self.rng.uniform(1, 3, n)
+        self.alpha[index] = self.rng.integers(50, 150, n, endpoint=True)
+        self.size[index] = self.rng.uniform(1, 3, n)
 
     def update(self):
         # Update position
         self.y += self.speed
-        self.x += math.sin(self.wobble_offset) * self.wobble_amount
+        self.x += np.sin(self.wobble_offset) * self.wobble_amount
         self.wobble_offset += self.wobble_speed
         self.rotation += self.rotation_speed
 
         # Reset if out of screen
-        if self.y > HEIGHT:
-            self.reset()
+        fallen = np.flatnonzero(self.y > HEIGHT)
+        if len(fallen):
+            self.reset(fallen)
+
+    def _sprite_steps(self):
+        # Quantise to sprite buckets; the diamond looks the same every 90 degrees
+        size_step = np.rint(self.size / ICE_SIZE_STEP).astype(np.int64)
+        rotation_step = np.floor((self.rotation % 90) / 90 * ICE_ROTATION_STEPS).astype(np.int64) % ICE_ROTATION_STEPS
+        alpha_step = np.rint(self.alpha / ICE_ALPHA_STEP).astype(np.int64)
+        half = size_step * ICE_SIZE_STEP * 2
+        left = (self.x - half).astype(np.int64)
+        top = (self.y - half).astype(np.int64)
+        return size_step, rotation_step, alpha_step, left, top
 
     def draw(self, surface):
-        # Create a surface for the ice particle
-        particle_surface = pygame.Surface((int(self.size * 4), int(self.size * 4)), pygame.SRCALPHA)
-        
-        # Draw the ice particle with a diamond shape
-        points = [
-            (self.size * 2, 0),  # Top
-            (self.size * 4, self.size * 2),  # Right
-            (self.size * 2, self.size * 4),  # Bottom
-            (0, self.size * 2)  # Left
-        ]
-        
-        # Rotate the points
-        rotated_points = []
-        center = (self.size * 2, self.size * 2)
+        size_step, rotation_step, alpha_step, left, top = self._sprite_steps()
+        blits = [(ice_sprite(s, r, a), (l, t))
+                 for s, r, a, l, t in zip(size_step.tolist(), rotation_step.tolist(), alpha_step.tolist(),
+                                          left.tolist(), top.tolist())]
+        surface.blits(blits, doreturn=False)
+
+    def dirty_rects(self):
+        """Screen rects of the particles as last drawn."""
+        size_step, _, _, left, top = self._sprite_steps()
+        sprite_size = (size_step * ICE_SIZE_STEP * 4).astype(np.int64)
+        return [pygame.Rect(l, t, s, s) for l, t, s in zip(left.tolist(), top.tolist(), sprite_size.tolist())]
+
+
+# Pre-rotated diamonds keyed by (size step, rotation step, alpha step)
+SPRITES = LRUCache(ICE_SPRITE_CACHE_SIZE)
+
+
+def _render_ice(size_step, rotation_step, alpha_step):
+    size = size_step * ICE_SIZE_STEP
+    rotation = (rotation_step + 0.5) * 90 / ICE_ROTATION_STEPS
+    alpha = min(alpha_step * ICE_ALPHA_STEP, 255)
+
+    # Create a surface for the ice particle
+    particle_surface = pygame.Surface((int(size * 4), int(size * 4)), pygame.SRCALPHA)
+    center = (size * 2, size * 2)
+    rad = math.radians(rotation)
+    cos_val = math.cos(rad)
+    sin_val = math.sin(rad)
+
+    def rotated(points):
+        # Rotate the points around the sprite center
+        result = []
         for point in points:
-            # Translate point to origin
-            x = point[0] - center[0]
-            y = point[1] - center[1]
-            
-            # Rotate
-            rad = math.radians(self.rotation)
-            cos_val = math.cos(rad)
-            sin_val = math.sin(rad)
-            new_x = x * cos_val - y * sin_val
-            new_y = x * sin_val + y * cos_val
-            
-            # Translate back
-            rotated_points.append((new_x + center[0], new_y + center[1]))
-        
-        # Draw the rotated diamond
-        pygame.draw.polygon(particle_surface, (*WHITE, self.alpha), rotated_points)
-        
-        # Add a highlight
-        highlight_points = [
-            (self.size * 2, self.size * 0.5),  # Top
-            (self.size * 3, self.size * 2),  # Right
-            (self.size * 2, self.size * 3.5),  # Bottom
-            (self.size, self.size * 2)  # Left
-        ]
-        
-        # Rotate highlight points
-        rotated_highlight = []
-        for point in highlight_points:
             x = point[0] - center[0]
             y = point[1] - center[1]
-            new_x = x * cos_val - y * sin_val
-            new_y = x * sin_val + y * cos_val
-            rotated_highlight.append((new_x + center[0], new_y + center[1]))
-        
-        # Draw the highlight
-        pygame.draw.polygon(particle_surface, (*WHITE, self.alpha + 50), rotated_highlight)
-        
-        # Blit the particle surface onto the main surface
-        surface.blit(particle_surface, (int(self.x - self.size * 2), int(self.y - self.size * 2))) 
\ No newline at end of file
+            result.append((x * cos_val - y * sin_val + center[0], x * sin_val + y * cos_val + center[1]))
+        return result
+
+    # Draw the rotated diamond
+    diamond = [(size * 2, 0), (size * 4, size * 2), (size * 2, size * 4), (0, size * 2)]
+    pygame.draw.polygon(particle_surface, (*WHITE, alpha), rotated(diamond))
+
+    # Add a highlight
+    highlight = [(size * 2, size * 0.5), (size * 3, size * 2), (size * 2, size * 3.5), (size, size * 2)]
+    pygame.draw.polygon(particle_surface, (*WHITE, min(alpha + 50, 255)), rotated(highlight))
+
+    if pygame.display.get_surface() is not None:
+        particle_surface = particle_surface.convert_alpha()
+    return particle_surface
+
+
+def ice_sprite(size_step, rotation_step, alpha_step):
+    return SPRITES.get_or_create((size_step, rotation_step, alpha_step),
+                                 lambda: _render_ice(size_step, rotation_step, alpha_step))
@@ -0,0 +1,148 @@
+"""
+Island-model NEAT: independent populations evolve in separate processes and periodically
+send their best genomes to a neighbouring island.
+
+Each island runs the whole evolutionary loop (evaluation, speciation and reproduction) on its
+own core, so the speed-up is not limited to the fitness function.
+"""
+import copy
+import queue
+import random
+import multiprocessing
+import neat
+from .evaluation import GenomeEvaluator, FitnessCache
+from .throughput import ThroughputReporter
+
+TOPOLOGIES = ('ring', 'random')
+# Seconds between checks that every island process is still running
+POLL_INTERVAL = 1.0
+
+
+def load_neat_config(config_path):
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def check_island_settings(settings):
+    """Raise ValueError for island options the island processes would only trip over later."""
+    if settings.migration_topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology {settings.migration_topology!r}, "
+                         f"expected one of {', '.join(TOPOLOGIES)}")
+    if settings.migration_interval < 1:
+        raise ValueError(f"migration_interval must be at least 1, got {settings.migration_interval}")
+    if settings.migrants < 0:
+        raise ValueError(f"migrants must not be negative, got {settings.migrants}")
+
+
+def migration_target(index, islands, topology, rng):
+    if topology == 'ring':
+        return (index + 1) % islands
+    if topology == 'random':
+        return rng.choice([i for i in range(islands) if i != index])
+    raise ValueError(f"Unknown migration topology {topology!r}")
+
+
+def add_migrants(population, migrants, rng):
+    """Replace random members of a freshly reproduced population with migrants, then re-speciate."""
+    replaced = rng.sample(sorted(population.population), min(len(migrants), len(population.population)))
+    for old_key, migrant in zip(replaced, migrants):
+        del population.population[old_key]
+        migrant = copy.deepcopy(migrant)
+        migrant.key = next(population.reproduction.genome_indexer)
+        migrant.fitness = None
+        population.reproduction.ancestors[migrant.key] = tuple()
+        population.population[migrant.key] = migrant
+    population.species.speciate(population.config, population.population, population.generation)
+
+
+def _run_island(index, islands, settings, config_path, generations, inboxes, stop, results):
+    # Migrants that nobody picks up must not keep this process alive at exit
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    random.seed(settings.seed + index)
+    rng = random.Random(settings.seed * islands + index)
+    config = load_neat_config(config_path)
+    population = neat.Population(config)
+    evaluator = GenomeEvaluator(1, settings.seed + index, settings.episode_options(), settings.stage_options())
+    cache = FitnessCache(settings.fitness_cache, settings.seed + index) if settings.fitness_cache > 0 else None
+    elite = []
+    # Simulated world ticks and network activations so far
+    counts = {'ticks': 0, 'activations': 0}
+
+    def totals():
+        if cache is None:
+            return dict(counts)
+        return {**counts, 'cache_hits': cache.hits, 'cache_misses': cache.misses}
+
+    if settings.metrics_file:
+        ThroughputReporter(settings.metrics_file, totals, island=index).attach(population)
+
+    def eval_genomes(genomes, config):
+        if cache is None:
+            ticks, activations, _ = evaluator.evaluate(genomes, config, population.generation)
+        else:
+            ticks, activations, _ = cache.evaluate(evaluator, genomes, config, population.generation)
+        counts['ticks'] += ticks
+        counts['activations'] += activations
+        ranked = sorted((g for _, g in genomes), key=lambda g: g.fitness, reverse=True)
+        elite[:] = [copy.deepcopy(g) for g in ranked[:settings.migrants]]
+
+    while not stop.is_set() and population.generation < generations:
+        chunk = min(settings.migration_interval, generations - population.generation)
+        best = population.run(eval_genomes, chunk)
+        results.put(('progress', index, population.generation, best.fitness))
+        if best.fitness >= config.fitness_threshold:
+            # Tell the other islands to wrap up as well
+            stop.set()
+            break
+
+        inboxes[migration_target(index, islands, settings.migration_topology, rng)].put(elite)
+        try:
+            while True:
+                add_migrants(population, inboxes[index].get_nowait(), rng)
+        except queue.Empty:
+            pass
+
+    results.put(('done', index, population.best_genome))
+
+
+def run_islands(settings, config_path, generations):
+    """Evolve ``settings.islands`` populations in parallel and return the best genome found."""
+    check_island_settings(settings)
+    islands = settings.islands
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_run_island,
+                                         args=(i, islands, settings, config_path, generations, inboxes, stop, results))
+                 for i in range(islands)]
+    for process in processes:
+        process.start()
+
+    winners = {}
+    while len(winners) < islands:
+        try:
+            message = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            # An island that died without reporting back would otherwise be waited for forever
+            crashed = [(i, p.exitcode) for i, p in enumerate(processes)
+                       if i not in winners and p.exitcode is not None]
+            if crashed:
+                stop.set()
+                for process in processes:
+                    process.terminate()
+                    process.join()
+                index, exitcode = crashed[0]
+                raise RuntimeError(f"Island {index} stopped with exit code {exitcode} before finishing")
+            continue
+        if message[0] == 'progress':
+            _, index, generation, fitness = message
+            print(f"Island {index}: generation {generation}, best fitness {fitness:.2f}")
+        else:
+            winners[message[1]] = message[2]
+
+    for process in processes:
+        process.join()
+    # An island stopped before its first generation has nothing to report
+    return max((g for g in winners.values() if g is not None), key=lambda g: g.fitness)
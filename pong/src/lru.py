@@ -0,0 +1,56 @@
+"""
+A small least-recently-used cache for rendered sprites, text and other values that are
+expensive to build but cheap to keep for a while.
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        # Evict the least recently used entries beyond the bound
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building it with ``factory()`` on a miss."""
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            value = factory()
+            self.put(key, value)
+            return value
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
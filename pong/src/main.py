@@ -1,18 +1,30 @@
 import pygame
 import sys
+import time
 import random
 from .config import *
 from .paddle import Paddle
 from .ball import Ball
 from .background import Background
 from .button import Button
-from .particle import Particle
-from .ai_trainer import AITrainer
+from .particle import ParticleSystem
+from .profiler import FrameProfiler
+from .physics import LEFT, RIGHT, PADDLE_X
+from .dirty_rects import DirtyRectRenderer
+from .display import init_pygame
+from .text import render_text
 
 class Game:
-    def __init__(self):
+    def __init__(self, dirty_rects=False, profile=False, profile_output=None):
+        init_pygame()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Pong")
+        # Optionally push only the changed parts of each frame to the window
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects else None
+        self.presented_state = None
+        # Per-phase frame timings: F3 shows them, F4 saves them to profile_output
+        self.profiler = FrameProfiler(enabled=profile)
+        self.profile_output = profile_output
         
         # Initialize fonts
         self.title_font = pygame.font.Font(None, 100)
@@ -21,8 +33,8 @@ class Game:
         self.small_font = pygame.font.Font(None, 36)
         
         # Initialize game objects
-        self.player = Paddle(20, HEIGHT // 2 - PADDLE_HEIGHT // 2, BLUE)
-        self.opponent = Paddle(WIDTH - 35, HEIGHT // 2 - PADDLE_HEIGHT // 2, RED)
+        self.player = Paddle(PADDLE_X[LEFT], HEIGHT // 2 - PADDLE_HEIGHT // 2, BLUE)
+        self.opponent = Paddle(PADDLE_X[RIGHT], HEIGHT // 2 - PADDLE_HEIGHT // 2, RED)
         self.ball = Ball()
         self.background = Background()
         
@@ -42,20 +54,125 @@ class Game:
         # Game state
         self.game_state = MENU
         self.game_mode = PVP
-        self.particles = []
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
         
-        # Clock for FPS
+        # Clock for FPS; a frame rate of 0 leaves the loop uncapped
         self.clock = pygame.time.Clock()
+        self.frame_rate = FRAME_RATE
+        # Seconds the last frame took, and simulated time still owed to the game
+        self.frame_time = 0.0
+        self.sim_time = 0.0
         
-        self.ai_trainer = AITrainer(self)
+        self._ai_trainer = None
+
+    @property
+    def ai_trainer(self):
+        # The trainer pulls in neat and parses config.txt, so it is only built when training starts
+        if self._ai_trainer is None:
+            from .ai_trainer import AITrainer
+            self._ai_trainer = AITrainer(self)
+        return self._ai_trainer
+
+    def save_profile(self):
+        """Export the profiled frames to ``profile_output``, or to a timestamped JSON trace."""
+        path = self.profile_output or time.strftime("profile-%Y%m%d-%H%M%S.json")
+        self.profiler.export(path)
+        print(f"Saved {len(self.profiler.trace)} profiled frames to {path}")
+
+    def quit(self):
+        if self.profile_output and self.profiler.trace:
+            self.save_profile()
+        pygame.quit()
+        sys.exit()
 
     def add_particles(self, x, y, color, count=5):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color))
+        self.particles.spawn(x, y, color, count)
+
+    def advance(self, keys):
+        """
+        Run the simulation in fixed steps for the time since the last frame, then place the
+        paddles and ball between their last two steps so motion stays smooth at any frame rate.
+        """
+        step = 1 / SIMULATION_RATE
+        self.sim_time += self.frame_time
+        steps = 0
+        while self.sim_time >= step and self.game_state == PLAYING:
+            if steps == MAX_CATCH_UP_STEPS:
+                # Too far behind: drop the backlog rather than spiral into ever longer frames
+                self.sim_time = 0.0
+                break
+            for view in (self.player, self.opponent, self.ball):
+                view.save_position()
+            self.step(keys, SPEED_RATE * step)
+            self.sim_time -= step
+            steps += 1
+
+        alpha = min(self.sim_time / step, 1.0)
+        for view in (self.player, self.opponent, self.ball):
+            view.show(alpha)
+
+    def step(self, keys, dt):
+        """One simulation step of ``dt`` units of 1/SPEED_RATE s."""
+        ball = self.ball.body
+
+        # Player 1 movement
+        if keys[pygame.K_UP]:
+            self.player.move(up=True, dt=dt)
+        if keys[pygame.K_DOWN]:
+            self.player.move(up=False, dt=dt)
+
+        # Player 2 or AI movement
+        if self.game_mode == PVP:
+            if keys[pygame.K_w]:
+                self.opponent.move(up=True, dt=dt)
+            if keys[pygame.K_s]:
+                self.opponent.move(up=False, dt=dt)
+        else:  # AI mode
+            self.opponent.prediction_update_timer += dt
+            
+            if ball.dx > 0:
+                if self.opponent.prediction_update_timer >= 10:
+                    time_to_reach = (self.opponent.body.x - (ball.rect_x + BALL_SIZE)) / ball.dx
+                    predicted_y = ball.rect_y + BALL_SIZE // 2 + (ball.dy * time_to_reach)
+                    predicted_y += random.uniform(-20, 20)
+                    predicted_y = max(PADDLE_HEIGHT/2, min(HEIGHT - PADDLE_HEIGHT/2, predicted_y))
+                    
+                    self.opponent.target_y = (predicted_y + self.opponent.last_prediction) / 2
+                    self.opponent.last_prediction = predicted_y
+                    self.opponent.prediction_update_timer = 0
+            else:
+                if abs(self.opponent.body.centery - HEIGHT/2) > 5:
+                    self.opponent.target_y = HEIGHT/2
+                    self.opponent.last_prediction = HEIGHT/2
+            
+            self.opponent.move_to_target(dt)
+
+        # Move ball
+        self.ball.move(dt)
+
+        # Ball collision with paddles
+        if self.ball.check_paddle_collision(self.player) or self.ball.check_paddle_collision(self.opponent):
+            pass
+
+        # Scoring
+        if ball.rect_x <= 0:
+            self.opponent.score += 1
+            self.add_particles(ball.rect_x + BALL_SIZE // 2, ball.rect_y + BALL_SIZE // 2, RED, 30)
+            self.ball.reset()
+        elif ball.rect_x + BALL_SIZE >= WIDTH:
+            self.player.score += 1
+            self.add_particles(ball.rect_x + BALL_SIZE // 2, ball.rect_y + BALL_SIZE // 2, BLUE, 30)
+            self.ball.reset()
+        
+        # Check for win condition
+        if self.player.score >= 10 or self.opponent.score >= 10:
+            self.game_state = GAME_OVER
 
     def draw_game(self):
-        self.background.update()
-        self.background.draw(self.screen)
+        with self.profiler.section('background.update'):
+            self.background.update()
+        with self.profiler.section('background.draw'):
+            self.background.draw(self.screen)
         
         # Draw animated center line
         y = self.background.center_line_offset
@@ -64,135 +181,189 @@ class Game:
             y += CENTER_LINE_DASH_LENGTH + CENTER_LINE_GAP
         
         # Update and draw particles
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        with self.profiler.section('particles.update'):
+            self.particles.update()
+        with self.profiler.section('particles.draw'):
+            self.particles.draw(self.screen)
         
-        self.player.draw(self.screen)
-        self.opponent.draw(self.screen)
-        self.ball.draw(self.screen)
+        with self.profiler.section('paddles.draw'):
+            self.player.draw(self.screen)
+            self.opponent.draw(self.screen)
+        with self.profiler.section('ball.draw'):
+            self.ball.draw(self.screen)
         
         # Draw scores
-        for score, x_pos, color in [(self.player.score, WIDTH // 4, BLUE), (self.opponent.score, 3 * WIDTH // 4, RED)]:
-            score_text = self.score_font.render(str(score), True, color)
-            score_rect = score_text.get_rect(center=(x_pos, 70))
-            self.screen.blit(score_text, score_rect)
+        with self.profiler.section('text'):
+            for score, x_pos, color in [(self.player.score, WIDTH // 4, BLUE), (self.opponent.score, 3 * WIDTH // 4, RED)]:
+                score_text = render_text(self.score_font, str(score), color)
+                score_rect = score_text.get_rect(center=(x_pos, 70))
+                self.screen.blit(score_text, score_rect)
+
+    def dirty_rects(self, state):
+        """Regions of the screen that drawing ``state`` may have changed since the previous frame."""
+        rects = self.background.dirty_rects()
+        if state == MENU:
+            rects += [button.dirty_rect() for button in
+                      (self.start_button, self.controls_button, self.quit_button, self.train_ai_button)]
+        elif state == MODE_SELECT:
+            rects += [button.dirty_rect() for button in (self.pvp_button, self.pvai_button, self.back_button)]
+        elif state == PLAYING:
+            # The scrolling center line, the sprites and the scores
+            rects.append(pygame.Rect(WIDTH//2 - 2, 0, 5, HEIGHT))
+            rects += [self.particles.dirty_rect(), self.player.dirty_rect(), self.opponent.dirty_rect(),
+                      self.ball.dirty_rect()]
+            for score, x_pos, color in [(self.player.score, WIDTH // 4, BLUE), (self.opponent.score, 3 * WIDTH // 4, RED)]:
+                rects.append(render_text(self.score_font, str(score), color).get_rect(center=(x_pos, 70)))
+        elif state == GAME_OVER:
+            rects.append(self.menu_button.dirty_rect())
+        rects.append(self.profiler.overlay_rect())
+        return rects
+
+    def present(self, state):
+        """Show the frame just drawn for ``state``."""
+        if self.renderer is None:
+            pygame.display.flip()
+            return
+        if state != self.presented_state:
+            # A different screen than last frame; push all of it
+            self.renderer.invalidate()
+        self.presented_state = state
+        self.renderer.add(*self.dirty_rects(state))
+        self.renderer.add_in_place(*self.background.gradient_strips)
+        self.renderer.present()
 
     def draw_menu(self):
         self.screen.fill(BLACK)
-        self.background.update()
-        self.background.draw(self.screen)
+        with self.profiler.section('background.update'):
+            self.background.update()
+        with self.profiler.section('background.draw'):
+            self.background.draw(self.screen)
         
         # Draw title
-        title = self.title_font.render("PONG", True, WHITE)
-        title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
+        with self.profiler.section('text'):
+            title = render_text(self.title_font, "PONG", WHITE)
+            title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
         
-        # Draw title glow
-        glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
-        self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
-        self.screen.blit(title, title_rect)
+            # Draw title glow
+            glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
+            self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
+            self.screen.blit(title, title_rect)
         
         # Draw buttons
-        self.start_button.draw(self.screen)
-        self.controls_button.draw(self.screen)
-        self.quit_button.draw(self.screen)
-        self.train_ai_button.draw(self.screen)
+        with self.profiler.section('buttons.draw'):
+            self.start_button.draw(self.screen)
+            self.controls_button.draw(self.screen)
+            self.quit_button.draw(self.screen)
+            self.train_ai_button.draw(self.screen)
 
     def draw_mode_select(self):
         self.screen.fill(BLACK)
-        self.background.update()
-        self.background.draw(self.screen)
+        with self.profiler.section('background.update'):
+            self.background.update()
+        with self.profiler.section('background.draw'):
+            self.background.draw(self.screen)
         
         # Draw title
-        title = self.title_font.render("SELECT MODE", True, WHITE)
-        title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
+        with self.profiler.section('text'):
+            title = render_text(self.title_font, "SELECT MODE", WHITE)
+            title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
         
-        # Draw title glow
-        glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
-        self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
-        self.screen.blit(title, title_rect)
+            # Draw title glow
+            glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
+            self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
+            self.screen.blit(title, title_rect)
         
         # Draw buttons
-        self.pvp_button.draw(self.screen)
-        self.pvai_button.draw(self.screen)
-        self.back_button.draw(self.screen)
+        with self.profiler.section('buttons.draw'):
+            self.pvp_button.draw(self.screen)
+            self.pvai_button.draw(self.screen)
+            self.back_button.draw(self.screen)
 
     def draw_controls(self):
         self.screen.fill(BLACK)
-        self.background.update()
-        self.background.draw(self.screen)
+        with self.profiler.section('background.update'):
+            self.background.update()
+        with self.profiler.section('background.draw'):
+            self.background.draw(self.screen)
         
         # Draw title
-        title = self.title_font.render("CONTROLS", True, WHITE)
-        title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
+        with self.profiler.section('text'):
+            title = render_text(self.title_font, "CONTROLS", WHITE)
+            title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//4))
         
-        # Draw title glow
-        glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
-        self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
-        self.screen.blit(title, title_rect)
+            # Draw title glow
+            glow_surface = pygame.Surface((title_rect.width + 40, title_rect.height + 40), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, title_rect.width + 40, title_rect.height + 40), border_radius=20)
+            self.screen.blit(glow_surface, (title_rect.x - 20, title_rect.y - 20))
+            self.screen.blit(title, title_rect)
         
-        # Draw control instructions
-        controls = [
-            "Player 1: Use UP and DOWN arrow keys",
-            "Player 2: Use W and S keys (in PvP mode)",
-            "First player to score 5 points wins",
-            "Press ESC to return to menu"
-        ]
+            # Draw control instructions
+            controls = [
+                "Player 1: Use UP and DOWN arrow keys",
+                "Player 2: Use W and S keys (in PvP mode)",
+                "First player to score 5 points wins",
+                "Press ESC to return to menu"
+            ]
         
-        for i, text in enumerate(controls):
-            control_text = self.menu_font.render(text, True, WHITE)
-            control_rect = control_text.get_rect(center=(WIDTH//2, HEIGHT//2 + i*50))
+            for i, text in enumerate(controls):
+                control_text = render_text(self.menu_font, text, WHITE)
+                control_rect = control_text.get_rect(center=(WIDTH//2, HEIGHT//2 + i*50))
             
-            # Draw text glow
-            glow_surface = pygame.Surface((control_rect.width + 20, control_rect.height + 20), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*WHITE, 20), (0, 0, control_rect.width + 20, control_rect.height + 20), border_radius=10)
-            self.screen.blit(glow_surface, (control_rect.x - 10, control_rect.y - 10))
+                # Draw text glow
+                glow_surface = pygame.Surface((control_rect.width + 20, control_rect.height + 20), pygame.SRCALPHA)
+                pygame.draw.rect(glow_surface, (*WHITE, 20), (0, 0, control_rect.width + 20, control_rect.height + 20), border_radius=10)
+                self.screen.blit(glow_surface, (control_rect.x - 10, control_rect.y - 10))
             
-            self.screen.blit(control_text, control_rect)
+                self.screen.blit(control_text, control_rect)
 
     def draw_game_over(self):
         self.screen.fill(BLACK)
-        self.background.update()
-        self.background.draw(self.screen)
+        with self.profiler.section('background.update'):
+            self.background.update()
+        with self.profiler.section('background.draw'):
+            self.background.draw(self.screen)
         
         # Draw winner text
-        winner = "Player 1" if self.player.score > self.opponent.score else "Player 2" if self.game_mode == PVP else "AI"
-        winner_text = self.title_font.render(f"{winner} Wins!", True, WHITE)
-        winner_rect = winner_text.get_rect(center=(WIDTH//2, HEIGHT//3))
+        with self.profiler.section('text'):
+            winner = "Player 1" if self.player.score > self.opponent.score else "Player 2" if self.game_mode == PVP else "AI"
+            winner_text = render_text(self.title_font, f"{winner} Wins!", WHITE)
+            winner_rect = winner_text.get_rect(center=(WIDTH//2, HEIGHT//3))
         
-        # Draw winner glow
-        glow_surface = pygame.Surface((winner_rect.width + 40, winner_rect.height + 40), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, winner_rect.width + 40, winner_rect.height + 40), border_radius=20)
-        self.screen.blit(glow_surface, (winner_rect.x - 20, winner_rect.y - 20))
-        self.screen.blit(winner_text, winner_rect)
+            # Draw winner glow
+            glow_surface = pygame.Surface((winner_rect.width + 40, winner_rect.height + 40), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surface, (*WHITE, 30), (0, 0, winner_rect.width + 40, winner_rect.height + 40), border_radius=20)
+            self.screen.blit(glow_surface, (winner_rect.x - 20, winner_rect.y - 20))
+            self.screen.blit(winner_text, winner_rect)
         
-        # Draw final score
-        score_text = self.menu_font.render(f"{self.player.score} - {self.opponent.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(WIDTH//2, HEIGHT//2))
+            # Draw final score
+            score_text = render_text(self.menu_font, f"{self.player.score} - {self.opponent.score}", WHITE)
+            score_rect = score_text.get_rect(center=(WIDTH//2, HEIGHT//2))
         
-        # Draw score glow
-        glow_surface = pygame.Surface((score_rect.width + 20, score_rect.height + 20), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*WHITE, 20), (0, 0, score_rect.width + 20, score_rect.height + 20), border_radius=10)
-        self.screen.blit(glow_surface, (score_rect.x - 10, score_rect.y - 10))
+            # Draw score glow
+            glow_surface = pygame.Surface((score_rect.width + 20, score_rect.height + 20), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surface, (*WHITE, 20), (0, 0, score_rect.width + 20, score_rect.height + 20), border_radius=10)
+            self.screen.blit(glow_surface, (score_rect.x - 10, score_rect.y - 10))
         
-        self.screen.blit(score_text, score_rect)
+            self.screen.blit(score_text, score_rect)
         
         # Draw menu button
-        self.menu_button.draw(self.screen)
+        with self.profiler.section('buttons.draw'):
+            self.menu_button.draw(self.screen)
 
-    def run(self):
+    def run(self, max_frames=None):
+        """Run the game loop; with ``max_frames`` it returns after that many frames."""
+        frames = 0
         while True:
+            self.profiler.begin_frame()
             mouse_pos = pygame.mouse.get_pos()
             
-            for event in pygame.event.get():
+            with self.profiler.section('events'):
+                events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
                 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if self.game_state == MENU:
@@ -204,11 +375,12 @@ class Game:
                             self.game_state = CONTROLS
                         elif self.quit_button.rect.collidepoint(mouse_pos):
                             self.quit_button.click()
-                            pygame.quit()
-                            sys.exit()
+                            self.quit()
                         elif self.train_ai_button.rect.collidepoint(mouse_pos):
                             self.train_ai_button.click()
                             self.ai_trainer.run_neat()
+                            # The training window drew over the whole screen
+                            self.presented_state = None
                     
                     elif self.game_state == MODE_SELECT:
                         if self.pvp_button.rect.collidepoint(mouse_pos):
@@ -238,7 +410,13 @@ class Game:
                     if event.key == pygame.K_ESCAPE:
                         if self.game_state in [PLAYING, CONTROLS]:
                             self.game_state = MENU
+                    elif event.key == pygame.K_F3:
+                        self.profiler.toggle_overlay()
+                    elif event.key == pygame.K_F4:
+                        self.save_profile()
 
+            # The state this frame is drawn for; a won game only shows game over next frame
+            state = self.game_state
             if self.game_state == MENU:
                 self.start_button.check_hover(mouse_pos)
                 self.controls_button.check_hover(mouse_pos)
@@ -256,68 +434,24 @@ class Game:
                 self.draw_controls()
             
             elif self.game_state == PLAYING:
-                # Player 1 movement
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_UP]:
-                    self.player.move(up=True)
-                if keys[pygame.K_DOWN]:
-                    self.player.move(up=False)
-
-                # Player 2 or AI movement
-                if self.game_mode == PVP:
-                    if keys[pygame.K_w]:
-                        self.opponent.move(up=True)
-                    if keys[pygame.K_s]:
-                        self.opponent.move(up=False)
-                else:  # AI mode
-                    self.opponent.prediction_update_timer += 1
-                    
-                    if self.ball.dx > 0:
-                        if self.opponent.prediction_update_timer >= 10:
-                            time_to_reach = (self.opponent.rect.left - self.ball.rect.right) / self.ball.dx
-                            predicted_y = self.ball.rect.centery + (self.ball.dy * time_to_reach)
-                            predicted_y += random.uniform(-20, 20)
-                            predicted_y = max(PADDLE_HEIGHT/2, min(HEIGHT - PADDLE_HEIGHT/2, predicted_y))
-                            
-                            self.opponent.target_y = (predicted_y + self.opponent.last_prediction) / 2
-                            self.opponent.last_prediction = predicted_y
-                            self.opponent.prediction_update_timer = 0
-                    else:
-                        if abs(self.opponent.rect.centery - HEIGHT/2) > 5:
-                            self.opponent.target_y = HEIGHT/2
-                            self.opponent.last_prediction = HEIGHT/2
-                    
-                    self.opponent.move_to_target()
-
-                # Move ball
-                self.ball.move()
-
-                # Ball collision with paddles
-                if self.ball.check_paddle_collision(self.player) or self.ball.check_paddle_collision(self.opponent):
-                    pass
-
-                # Scoring
-                if self.ball.rect.left <= 0:
-                    self.opponent.score += 1
-                    self.add_particles(self.ball.rect.centerx, self.ball.rect.centery, RED, 30)
-                    self.ball.reset()
-                elif self.ball.rect.right >= WIDTH:
-                    self.player.score += 1
-                    self.add_particles(self.ball.rect.centerx, self.ball.rect.centery, BLUE, 30)
-                    self.ball.reset()
-                
-                # Check for win condition
-                if self.player.score >= 10 or self.opponent.score >= 10:
-                    self.game_state = GAME_OVER
-                
+                with self.profiler.section('simulation'):
+                    self.advance(pygame.key.get_pressed())
                 self.draw_game()
             
             elif self.game_state == GAME_OVER:
                 self.menu_button.check_hover(mouse_pos)
                 self.draw_game_over()
 
-            pygame.display.flip()
-            self.clock.tick(60)
+            with self.profiler.section('overlay'):
+                self.profiler.draw_overlay(self.screen)
+            with self.profiler.section('present'):
+                self.present(state)
+            self.profiler.end_frame()
+            self.frame_time = self.clock.tick(self.frame_rate) / 1000
+
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                return
 
 if __name__ == "__main__":
     game = Game()
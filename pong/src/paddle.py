@@ -1,8 +1,12 @@
 import pygame
-from .config import PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_SPEED, WHITE, HEIGHT
+from .config import PADDLE_WIDTH, PADDLE_HEIGHT, WHITE, PADDLE_SPRITE_CACHE_SIZE
+from .lru import LRUCache
+from .physics import PaddleBody
 
 class Paddle:
+    """Drawing view of a paddle; the physics lives in physics.PaddleBody."""
     def __init__(self, x, y, color=WHITE):
+        self.body = PaddleBody(x, y)
         self.rect = pygame.Rect(x, y, PADDLE_WIDTH, PADDLE_HEIGHT)
         self.score = 0
         self.color = color
@@ -10,56 +14,113 @@ class Paddle:
         self.glow_direction = 1
         self.hit_animation = 0
         self.target_y = y
-        self.speed = PADDLE_SPEED
         self.last_prediction = y
         self.prediction_update_timer = 0
+        # Position before the latest simulation step, for drawing in between steps
+        self.previous_y = y
 
-    def move(self, up=True):
-        if up and self.rect.top > 0:
-            self.rect.y -= self.speed
-        elif not up and self.rect.bottom < HEIGHT:
-            self.rect.y += self.speed
-
-    def move_to_target(self):
-        if abs(self.rect.centery - self.target_y) > 2:
-            distance = self.target_y - self.rect.centery
-            move_amount = distance * 0.2
-            
-            if abs(move_amount) < 0.5:
-                move_amount = 0.5 if move_amount > 0 else -0.5
-                
-            self.rect.centery += move_amount
-            self.rect.top = max(0, min(HEIGHT - PADDLE_HEIGHT, self.rect.top))
+    def move(self, up=True, dt=1.0):
+        self.body.move(up, dt)
+        self.rect.y = self.body.y
+
+    def move_to_target(self, dt=1.0):
+        self.body.move_to_target(self.target_y, dt)
+        self.rect.y = self.body.y
+
+    def save_position(self):
+        """Remember where the paddle is before a simulation step."""
+        self.previous_y = self.body.y
+
+    def show(self, alpha):
+        """Draw the paddle ``alpha`` of the way from its previous to its current step position."""
+        self.rect.y = self.previous_y + (self.body.y - self.previous_y) * alpha
+
+    def sync(self, y, hit=False):
+        """Show the paddle at ``y``, for paddles simulated elsewhere (e.g. the training engine)."""
+        self.body.y = int(y)
+        self.rect.y = self.body.y
+        if hit:
+            self.hit_animation = 1.0
 
     def draw(self, screen):
+        screen.blits(self.sprites(), doreturn=False)
+
+    def sprites(self):
+        """
+        The (sprite, position) pairs for one frame, in drawing order, advancing the animations;
+        for callers that batch many paddles into a single ``Surface.blits``.
+        """
+        sprites = []
         # Draw glow effect
         if self.glow_radius > 0:
-            glow_surface = pygame.Surface((PADDLE_WIDTH + self.glow_radius*2, PADDLE_HEIGHT + self.glow_radius*2), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*self.color, 50), (0, 0, PADDLE_WIDTH + self.glow_radius*2, PADDLE_HEIGHT + self.glow_radius*2), border_radius=15)
-            screen.blit(glow_surface, (self.rect.x - self.glow_radius, self.rect.y - self.glow_radius))
+            sprites.append((glow_sprite(self.color, self.glow_radius), (self.rect.x - self.glow_radius, self.rect.y - self.glow_radius)))
         
         # Draw paddle with rounded corners and gradient
-        paddle_surface = pygame.Surface((PADDLE_WIDTH, PADDLE_HEIGHT), pygame.SRCALPHA)
-        for i in range(PADDLE_HEIGHT):
-            alpha = int(255 * (1 - abs(i - PADDLE_HEIGHT/2) / (PADDLE_HEIGHT/2)))
-            color = (*self.color, alpha)
-            pygame.draw.line(paddle_surface, color, 
-                           (0, i),
-                           (PADDLE_WIDTH, i))
-        
-        # Draw the rounded rectangle
-        pygame.draw.rect(paddle_surface, self.color, (0, 0, PADDLE_WIDTH, PADDLE_HEIGHT), border_radius=15)
-        screen.blit(paddle_surface, self.rect)
+        sprites.append((body_sprite(self.color), self.rect.topleft))
         
         # Hit animation
         if self.hit_animation > 0:
-            hit_surface = pygame.Surface((PADDLE_WIDTH + 20, PADDLE_HEIGHT + 20), pygame.SRCALPHA)
-            alpha = int(255 * (1 - self.hit_animation))
-            pygame.draw.rect(hit_surface, (*WHITE, alpha), (0, 0, PADDLE_WIDTH + 20, PADDLE_HEIGHT + 20), border_radius=20)
-            screen.blit(hit_surface, (self.rect.x - 10, self.rect.y - 10))
+            sprites.append((hit_sprite(self.hit_animation), (self.rect.x - 10, self.rect.y - 10)))
             self.hit_animation -= 0.1
         
         # Update glow effect
         self.glow_radius += 0.5 * self.glow_direction
         if self.glow_radius >= 10 or self.glow_radius <= 0:
-            self.glow_direction *= -1 
\ No newline at end of file
+            self.glow_direction *= -1
+        return sprites
+
+    def dirty_rect(self):
+        """Area the paddle may cover when drawn, including its glow and hit flash."""
+        return self.rect.inflate(22, 22)
+
+
+# Pre-rendered paddle surfaces shared by every paddle. Trainer paddles get random colors,
+# so the cache is bounded and drops the least recently drawn sprites.
+SPRITES = LRUCache(PADDLE_SPRITE_CACHE_SIZE)
+
+
+def _finish(surface):
+    # Match the display's pixel format once a window exists, which makes every later blit cheaper
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+def _render_glow(color, radius):
+    size = (PADDLE_WIDTH + radius*2, PADDLE_HEIGHT + radius*2)
+    glow_surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(glow_surface, (*color, 50), (0, 0, *size), border_radius=15)
+    return _finish(glow_surface)
+
+
+def _render_body(color):
+    paddle_surface = pygame.Surface((PADDLE_WIDTH, PADDLE_HEIGHT), pygame.SRCALPHA)
+    for i in range(PADDLE_HEIGHT):
+        alpha = int(255 * (1 - abs(i - PADDLE_HEIGHT/2) / (PADDLE_HEIGHT/2)))
+        pygame.draw.line(paddle_surface, (*color, alpha), (0, i), (PADDLE_WIDTH, i))
+    pygame.draw.rect(paddle_surface, color, (0, 0, PADDLE_WIDTH, PADDLE_HEIGHT), border_radius=15)
+    return _finish(paddle_surface)
+
+
+def _render_hit(step):
+    hit_surface = pygame.Surface((PADDLE_WIDTH + 20, PADDLE_HEIGHT + 20), pygame.SRCALPHA)
+    alpha = int(255 * (1 - step / 10))
+    pygame.draw.rect(hit_surface, (*WHITE, alpha), (0, 0, PADDLE_WIDTH + 20, PADDLE_HEIGHT + 20), border_radius=20)
+    return _finish(hit_surface)
+
+
+def glow_sprite(color, glow_radius):
+    # The glow radius moves in half-pixel steps
+    step = int(glow_radius * 2)
+    return SPRITES.get_or_create(('glow', color, PADDLE_WIDTH, PADDLE_HEIGHT, step),
+                                 lambda: _render_glow(color, step / 2))
+
+
+def body_sprite(color):
+    return SPRITES.get_or_create(('body', color, PADDLE_WIDTH, PADDLE_HEIGHT), lambda: _render_body(color))
+
+
+def hit_sprite(hit_animation):
+    # The hit flash fades in tenths
+    step = round(hit_animation * 10)
+    return SPRITES.get_or_create(('hit', PADDLE_WIDTH, PADDLE_HEIGHT, step), lambda: _render_hit(step))
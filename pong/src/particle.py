@@ -1,7 +1,9 @@
 import pygame
 import random
 import math
-from .config import WHITE
+import numpy as np
+from .config import WHITE, PARTICLE_ALPHA_LEVELS, PARTICLE_SPRITE_CACHE_SIZE
+from .lru import LRUCache
 
 class Particle:
     def __init__(self, x, y, color):
@@ -40,4 +42,111 @@ class Particle:
         pygame.draw.circle(particle_surface, (r, g, b, alpha), (size, size), size)
         
         # Blit the particle surface onto the main surface
-        surface.blit(particle_surface, (int(self.x) - size, int(self.y) - size)) 
\ No newline at end of file
+        surface.blit(particle_surface, (int(self.x) - size, int(self.y) - size))
+
+
+class ParticleSystem:
+    """
+    Particles kept in preallocated NumPy arrays with a fixed capacity. Live particles always
+    occupy the first ``count`` slots: updates are vectorised and dead particles are removed by
+    compacting the arrays. Drawing blits cached circle sprites in one ``Surface.blits`` call.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.decay = np.zeros(capacity)
+        # Colors are stored as indices into a small palette of the colors seen so far
+        self.color_id = np.zeros(capacity, dtype=np.int64)
+        self.palette = []
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, color, count=5):
+        """Add up to ``count`` particles at (x, y); a full system drops the surplus."""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        color = tuple(color[:3])
+        if color not in self.palette:
+            self.palette.append(color)
+
+        new = slice(self.count, self.count + count)
+        speed = self.rng.uniform(0.5, 2, count)
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * speed
+        self.vy[new] = np.sin(angle) * speed
+        self.size[new] = self.rng.integers(2, 5, count)
+        self.life[new] = 1.0
+        self.decay[new] = self.rng.uniform(0.05, 0.1, count)
+        self.color_id[new] = self.palette.index(color)
+        self.count += count
+
+    def update(self):
+        live = slice(0, self.count)
+        self.x[live] += self.vx[live]
+        self.y[live] += self.vy[live]
+        self.life[live] -= self.decay[live]
+        self.size[live] = np.maximum(0, self.size[live] - 0.2)
+
+        # Compact the survivors to the front, keeping their order
+        alive = np.flatnonzero(self.life[live] > 0)
+        if len(alive) < self.count:
+            for array in (self.x, self.y, self.vx, self.vy, self.size, self.life, self.decay, self.color_id):
+                array[:len(alive)] = array[alive]
+            self.count = len(alive)
+
+    def draw(self, surface):
+        if self.count == 0:
+            return
+        live = slice(0, self.count)
+        size = self.size[live].astype(np.int64)
+        alpha_level = np.ceil(self.life[live] * PARTICLE_ALPHA_LEVELS).astype(np.int64)
+        left = self.x[live].astype(np.int64) - size
+        top = self.y[live].astype(np.int64) - size
+
+        blits = []
+        for i in np.flatnonzero(size > 0).tolist():
+            sprite = particle_sprite(self.palette[self.color_id[i]], int(size[i]), int(alpha_level[i]))
+            blits.append((sprite, (int(left[i]), int(top[i]))))
+        surface.blits(blits, doreturn=False)
+
+    def dirty_rect(self):
+        """Bounding rect of the particles as last drawn, or None when there are none."""
+        if self.count == 0:
+            return None
+        live = slice(0, self.count)
+        size = self.size[live].astype(np.int64)
+        left = self.x[live].astype(np.int64) - size
+        top = self.y[live].astype(np.int64) - size
+        x, y = int(left.min()), int(top.min())
+        return pygame.Rect(x, y, int((left + size * 2).max()) - x, int((top + size * 2).max()) - y)
+
+    def clear(self):
+        self.count = 0
+
+
+# Circle sprites shared by all particle systems, keyed by color, radius and alpha level
+SPRITES = LRUCache(PARTICLE_SPRITE_CACHE_SIZE)
+
+
+def _render_particle(color, size, alpha_level):
+    alpha = int(255 * alpha_level / PARTICLE_ALPHA_LEVELS)
+    particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(particle_surface, (*color, alpha), (size, size), size)
+    if pygame.display.get_surface() is not None:
+        particle_surface = particle_surface.convert_alpha()
+    return particle_surface
+
+
+def particle_sprite(color, size, alpha_level):
+    return SPRITES.get_or_create((color, size, alpha_level), lambda: _render_particle(color, size, alpha_level))
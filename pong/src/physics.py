@@ -0,0 +1,178 @@
+"""
+Pong physics shared by the game, the training window and the headless engines.
+
+Nothing here imports pygame. The functions accept plain numbers as well as NumPy arrays, so the
+single-ball bodies below and the population-wide engines run exactly the same rules. Positions
+follow pygame.Rect semantics: integer rects, floats rounded half away from zero when assigned.
+"""
+import math
+import random
+import numpy as np
+from .config import WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_SPEED
+from .config import BALL_SIZE, BALL_SPEED, MAX_BALL_SPEED, SPEED_INCREASE
+from .config import AI_PADDLE_SPEED, AI_PADDLE_ACCELERATION, AI_PADDLE_FRICTION
+
+LEFT = 0
+RIGHT = 1
+
+# Paddle x positions for the left and right side
+PADDLE_X = (20, WIDTH - 35)
+
+
+def _select(condition, a, b):
+    # np.where for arrays; a plain branch for single values, which is much cheaper per call
+    if isinstance(condition, (bool, np.bool_)):
+        return a if condition else b
+    return np.where(condition, a, b)
+
+
+def round_half_away(value):
+    """Round the way pygame.Rect does when a float is assigned to it."""
+    return np.copysign(np.floor(abs(value) + 0.5), value)
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """pygame.Rect.colliderect for rects given as numbers or arrays."""
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+def ball_touches_paddle(ball_x, ball_y, paddle_x, paddle_y):
+    return rects_overlap(ball_x, ball_y, BALL_SIZE, BALL_SIZE, paddle_x, paddle_y, PADDLE_WIDTH, PADDLE_HEIGHT)
+
+
+def bounce_off_paddle(dx, dy, speed, ball_y, paddle_y, noise):
+    """
+    New (dx, dy, speed) after the ball (rect top ``ball_y``) hits a paddle (rect top ``paddle_y``).
+    The bounce angle depends on where the paddle was hit, ``noise`` is added to dy and the ball
+    never leaves slower than its speed, which grows a little with every hit.
+    """
+    relative_intersect_y = ((paddle_y + PADDLE_HEIGHT // 2) - (ball_y + BALL_SIZE // 2)) / (PADDLE_HEIGHT / 2)
+    bounce_angle = relative_intersect_y * (math.pi / 4)
+
+    speed = np.minimum(MAX_BALL_SPEED, speed + SPEED_INCREASE)
+
+    magnitude = np.hypot(dx, dy)
+    new_dx = magnitude * np.cos(bounce_angle) * (1.0 - 2.0 * (dx > 0))
+    new_dy = magnitude * -np.sin(bounce_angle) + noise
+
+    current_speed = np.hypot(new_dx, new_dy)
+    scale = _select(current_speed < speed, speed / current_speed, 1.0)
+    return new_dx * scale, new_dy * scale, speed
+
+
+def bounce_off_walls(y, dy, rect_y):
+    """Reflect balls whose rect reaches the top or bottom wall and pin them to it. Returns (y, dy)."""
+    top = rect_y <= 0
+    bottom = (rect_y > 0) & (rect_y + BALL_SIZE >= HEIGHT)
+    dy = _select(top | bottom, -dy, dy)
+    y = _select(top, 0.0, _select(bottom, float(HEIGHT - BALL_SIZE), y))
+    return y, dy
+
+
+def fold_prediction(y):
+    """Reflect a predicted y coordinate off the top and bottom walls."""
+    y = np.mod(y, 2 * HEIGHT)
+    return _select(y > HEIGHT, 2 * HEIGHT - y, y)
+
+
+def predict_impact_y(side, ball_x, ball_y, dx, dy):
+    """Where a ball (rect position ``ball_x``, ``ball_y``) crosses ``side``'s paddle line, wall bounces included."""
+    paddle_x = PADDLE_X[side]
+    distance = (ball_x - paddle_x) if side == LEFT else (paddle_x - ball_x)
+    return fold_prediction(ball_y + dy * (distance / np.abs(dx)))
+
+
+def move_velocity_paddle(y, vel):
+    """
+    One tick of a trainer paddle: apply its velocity, then friction. A paddle that runs into
+    the top or bottom edge is clamped and stops. Returns (y, vel).
+    """
+    y = round_half_away(y + vel)
+    out = (y < 0) | (y + PADDLE_HEIGHT > HEIGHT)
+    return np.minimum(np.maximum(y, 0), HEIGHT - PADDLE_HEIGHT), _select(out, 0.0, vel * AI_PADDLE_FRICTION)
+
+
+def steer_velocity_paddle(vel, up_out, down_out):
+    """New trainer paddle velocity for the two network outputs: accelerate up, down, or slow down."""
+    up = (up_out > down_out) & (up_out > 0.5)
+    down = (up_out <= down_out) & (down_out > 0.5)
+    vel = _select(up, np.maximum(vel - AI_PADDLE_ACCELERATION, -AI_PADDLE_SPEED), vel)
+    vel = _select(down, np.minimum(vel + AI_PADDLE_ACCELERATION, AI_PADDLE_SPEED), vel)
+    return _select(up | down, vel, vel * AI_PADDLE_FRICTION)
+
+
+class PaddleBody:
+    """
+    A game paddle moved by keys or eased towards a target. ``y`` is kept sub-pixel and
+    ``rect_y`` is where its rect lands. Speeds are per 1/60 s; ``dt`` is the step length in those
+    units, so several shorter steps cover the same distance as one.
+    """
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.speed = PADDLE_SPEED
+
+    @property
+    def centery(self):
+        return self.y + PADDLE_HEIGHT // 2
+
+    @property
+    def rect_y(self):
+        return int(round_half_away(self.y))
+
+    def move(self, up=True, dt=1.0):
+        if up and self.y > 0:
+            self.y -= self.speed * dt
+        elif not up and self.y + PADDLE_HEIGHT < HEIGHT:
+            self.y += self.speed * dt
+
+    def move_to_target(self, target_y, dt=1.0):
+        if abs(self.centery - target_y) > 2:
+            distance = target_y - self.centery
+            move_amount = distance * 0.2 * dt
+
+            if abs(move_amount) < 0.5 * dt:
+                move_amount = 0.5 * dt if move_amount > 0 else -0.5 * dt
+
+            # Kept sub-pixel, so short steps still add up
+            self.y = max(0, min(HEIGHT - PADDLE_HEIGHT, self.y + move_amount))
+
+
+class BallBody:
+    """
+    A game ball: sub-pixel position, the integer rect position used for collisions, and velocity
+    per 1/60 s. ``move`` takes the step length ``dt`` in those units.
+    """
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.speed = BALL_SPEED
+        self.reset()
+
+    def reset(self):
+        self.rect_x = WIDTH // 2 - BALL_SIZE // 2
+        self.rect_y = HEIGHT // 2 - BALL_SIZE // 2
+        self.x = float(self.rect_x)
+        self.y = float(self.rect_y)
+        self.dx = self.speed * self.rng.choice([1, -1])
+        self.dy = self.speed * self.rng.choice([1, -1])
+        self.speed = BALL_SPEED
+
+    def move(self, dt=1.0):
+        self.x += self.dx * dt
+        self.y += self.dy * dt
+        self.rect_x = int(self.x)
+        self.rect_y = int(self.y)
+        self.y, self.dy = bounce_off_walls(self.y, self.dy, self.rect_y)
+
+    def collide(self, paddle):
+        """Bounce off ``paddle`` (a PaddleBody) if the ball is moving towards it and touches it."""
+        left = paddle.x < WIDTH / 2
+        if not ((self.dx < 0 and left) or (self.dx > 0 and not left)):
+            return False
+        if not ball_touches_paddle(self.rect_x, self.rect_y, paddle.x, paddle.rect_y):
+            return False
+
+        dx, dy, speed = bounce_off_paddle(self.dx, self.dy, self.speed, self.rect_y, paddle.rect_y, self.rng.uniform(-0.5, 0.5))
+        self.dx, self.dy, self.speed = float(dx), float(dy), float(speed)
+        self.x = float(paddle.x + PADDLE_WIDTH if left else paddle.x - BALL_SIZE)
+        return True
@@ -0,0 +1,153 @@
+"""
+Per-frame timing of the game loop's update and draw phases.
+
+Code wraps each phase in ``with profiler.section(name):``. While the profiler is disabled that
+returns a shared do-nothing context, so the instrumentation can stay in the hot path. When
+enabled, phases are timed with ``perf_counter_ns``; rolling p50/p99 per phase feed the F3
+overlay, and recent frames can be exported as a Chrome/Perfetto JSON trace or as CSV.
+"""
+import contextlib
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from .config import PROFILER_WINDOW, PROFILER_TRACE_FRAMES, PROFILER_OVERLAY_INTERVAL, WHITE
+from .text import render_text
+
+_NULL_SECTION = contextlib.nullcontext()
+
+
+class _Section:
+    """Times one named phase; reused for every frame."""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.started, time.perf_counter_ns() - self.started)
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=PROFILER_WINDOW, trace_frames=PROFILER_TRACE_FRAMES):
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.window = window
+        # phase -> rolling durations in ns, and the last frames' (phase, start ns, duration ns) events
+        self.durations = {}
+        self.trace = deque(maxlen=trace_frames)
+        self._sections = {}
+        self._events = []
+        self._frame_started = 0
+        self._frames = 0
+        self._overlay_lines = []
+        self._font = None
+        self._panel = None
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def _record(self, name, started, duration):
+        self._events.append((name, started, duration))
+
+    def toggle_overlay(self):
+        """Show or hide the overlay; showing it starts profiling."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_started = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        if not self._frame_started:
+            # Profiling was switched on halfway through this frame
+            self._events = []
+            return
+        frame_time = time.perf_counter_ns() - self._frame_started
+        self._events.append(('frame', self._frame_started, frame_time))
+        # A phase entered several times in one frame counts once, with the summed time
+        totals = {}
+        for name, _, duration in self._events:
+            totals[name] = totals.get(name, 0) + duration
+        for name, duration in totals.items():
+            durations = self.durations.get(name)
+            if durations is None:
+                durations = self.durations[name] = deque(maxlen=self.window)
+            durations.append(duration)
+        self.trace.append(self._events)
+        self._events = []
+        self._frame_started = 0
+        self._frames += 1
+
+    def percentiles(self):
+        """{phase: (p50 ms, p99 ms)} over the rolling window."""
+        stats = {}
+        for name, durations in self.durations.items():
+            ordered = sorted(durations)
+            last = len(ordered) - 1
+            stats[name] = (ordered[last // 2] / 1e6, ordered[round(last * 0.99)] / 1e6)
+        return stats
+
+    def overlay_rect(self):
+        if not self.overlay_visible:
+            return None
+        return pygame.Rect(0, 0, 260, 24 + 18 * len(self._overlay_lines))
+
+    def draw_overlay(self, surface):
+        if not self.overlay_visible:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 22)
+        # The numbers are refreshed a few times a second, so the text cache can keep up
+        if self._frames % PROFILER_OVERLAY_INTERVAL == 0 or not self._overlay_lines:
+            stats = sorted(self.percentiles().items(), key=lambda item: item[1][0], reverse=True)
+            self._overlay_lines = [f"{name:<18} {p50:6.2f} {p99:6.2f}" for name, (p50, p99) in stats]
+        rect = self.overlay_rect()
+        if self._panel is None or self._panel.get_size() != rect.size:
+            self._panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self._panel.fill((0, 0, 0, 170))
+            if pygame.display.get_surface() is not None:
+                self._panel = self._panel.convert_alpha()
+        surface.blit(self._panel, rect)
+        surface.blit(render_text(self._font, "phase  p50 / p99 ms  (F3, F4 saves)", WHITE), (6, 6))
+        for i, line in enumerate(self._overlay_lines):
+            surface.blit(render_text(self._font, line, WHITE), (6, 24 + i * 18))
+
+    def export_json(self, path):
+        """Write the recorded frames as a Chrome trace (chrome://tracing, Perfetto)."""
+        events = [{'name': name, 'ph': 'X', 'ts': started / 1000, 'dur': duration / 1000, 'pid': 0, 'tid': 0}
+                  for frame in self.trace for name, started, duration in frame]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_csv(self, path):
+        """Write one row per recorded frame with each phase's total milliseconds."""
+        phases = sorted(self.durations)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame_index'] + phases)
+            for index, frame in enumerate(self.trace):
+                totals = dict.fromkeys(phases, 0)
+                for name, _, duration in frame:
+                    totals[name] += duration
+                writer.writerow([index] + [f"{totals[name] / 1e6:.4f}" for name in phases])
+
+    def export(self, path):
+        """Export to ``path`` as CSV if it ends in .csv, otherwise as a JSON trace."""
+        if path.endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
@@ -0,0 +1,90 @@
+"""
+Trainer options read from the optional [Training] section of config.txt.
+
+neat-python ignores sections it does not know about, so these live next to the NEAT parameters.
+"""
+import os
+import configparser
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.txt')
+
+
+class TrainingSettings:
+    # Option name -> default value; the default's type decides how the option is parsed
+    DEFAULTS = {
+        'headless': False,  # Train without the pygame training window
+        'workers': 1,       # Processes used to evaluate genomes, 0 means one per CPU core
+        'seed': 0,          # Seed for evolution and for every genome's episode
+        'max_hits': 500,    # Paddle hits after which a headless episode ends
+        'engine': 'vector',          # Headless simulator: vector (whole population) or event (event-driven)
+        'decision_interval': 1,      # Event engine only: ticks each controller decision is held for
+        'islands': 1,       # Independent populations evolved in parallel, 1 disables the island model
+        'migration_interval': 5,     # Generations between migrations
+        'migrants': 2,               # Best genomes each island sends per migration
+        'migration_topology': 'ring',  # ring or random
+        'distributed': False,        # Hand evaluation to remote workers over TCP
+        'host': '127.0.0.1',         # Address the coordinator listens on and workers connect to
+        'port': 5555,
+        'batch_size': 25,            # Genomes per batch sent to a worker
+        'heartbeat_timeout': 10.0,   # Seconds of worker silence before its batch is re-queued
+        'view': 'top',               # Training window: full (every genome), top (best view_top_k) or stats
+        'view_top_k': 10,            # Genomes drawn by the top view
+        'render_interval': 1,        # Simulation ticks per drawn frame, 0 = as many as fit in a frame
+        'render_generations': 1,     # Generations between drawn generations; the others show stats only
+        'checkpoint_interval': 1,    # Generations between checkpoints, 0 = no checkpoints
+        'checkpoint_dir': 'checkpoints',
+        'checkpoint_keep_last': 5,   # Newest checkpoints kept...
+        'checkpoint_keep_every': 50,  # ...plus every checkpoint_keep_every-th generation, 0 = none
+        'stage_ticks': '',           # Tick budgets of headless evaluation stages, e.g. "600, 2400"; empty = no stages
+        'stage_keep': 0.25,          # Fraction of the still playing worlds that continue into the next stage
+        'fitness_cache': 4096,       # Fitness of genomes already played, reused by headless evaluation; 0 = off
+        'metrics_file': 'training_metrics.jsonl',  # Per-generation timings and throughput appended here, empty = off
+    }
+
+    def __init__(self, **values):
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, values.pop(name, default))
+        if values:
+            raise ValueError(f"Unknown training option(s): {', '.join(sorted(values))}")
+
+    def episode_options(self):
+        """Keyword arguments describing one headless episode, see evaluation.Episodes."""
+        return {'max_hits': self.max_hits, 'engine': self.engine, 'decision_interval': self.decision_interval}
+
+    def stage_options(self):
+        """Keyword arguments for headless evaluation stages, see evaluation.play_in_stages."""
+        return {'stage_ticks': self.stage_budgets(), 'stage_keep': self.stage_keep}
+
+    def stage_budgets(self):
+        """The tick budgets in stage_ticks, as a list of increasing numbers."""
+        budgets = self.stage_ticks
+        if isinstance(budgets, str):
+            budgets = budgets.replace(',', ' ').split()
+        budgets = [int(ticks) for ticks in budgets]
+        if any(ticks <= 0 for ticks in budgets) or budgets != sorted(set(budgets)):
+            raise ValueError(f"stage_ticks must be increasing positive tick counts, got {self.stage_ticks!r}")
+        if not 0 < self.stage_keep <= 1:
+            raise ValueError(f"stage_keep must be in (0, 1], got {self.stage_keep!r}")
+        return budgets
+
+    @classmethod
+    def from_file(cls, path=CONFIG_PATH, section='Training'):
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        values = {}
+        if parser.has_section(section):
+            for name in parser.options(section):
+                if name not in cls.DEFAULTS:
+                    raise ValueError(f"Unknown option {name!r} in [{section}] section of {path}")
+                values[name] = cls._parse(parser, section, name, cls.DEFAULTS[name])
+        return cls(**values)
+
+    @staticmethod
+    def _parse(parser, section, name, default):
+        if isinstance(default, bool):
+            return parser.getboolean(section, name)
+        if isinstance(default, int):
+            return parser.getint(section, name)
+        if isinstance(default, float):
+            return parser.getfloat(section, name)
+        return parser.get(section, name)
@@ -0,0 +1,103 @@
+"""
+Startup profiling: time spent importing each module and in each startup phase, up to the first
+menu frame.
+
+``python run.py --startup-report`` prints the report. ``--startup-budget SECONDS`` makes run.py
+exit with status 1 when the first frame takes longer than that, so CI can keep startup fast.
+Times are measured from the moment run.py starts timing; interpreter start-up is not included.
+"""
+import sys
+import time
+
+
+class _TimedLoader:
+    """Wraps a module loader so ImportTimer sees when the module's code starts and finishes."""
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.timer._enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer._exit()
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class ImportTimer:
+    """
+    A meta path finder that times every module imported while it is installed. Records hold
+    (module, seconds including nested imports, seconds spent in the module itself).
+    """
+    def __init__(self):
+        self.records = []
+        self._stack = []
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _enter(self, name):
+        # [module, start time, time spent in nested imports]
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        name, started, nested = self._stack.pop()
+        total = time.perf_counter() - started
+        if self._stack:
+            self._stack[-1][2] += total
+        self.records.append((name, total, total - nested))
+
+    def slowest(self, count=15):
+        return sorted(self.records, key=lambda record: record[2], reverse=True)[:count]
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.imports = ImportTimer()
+        self.imports.install()
+
+    def mark(self, label):
+        """Close the current startup phase under ``label``."""
+        now = time.perf_counter()
+        self.phases.append((label, now - self.last))
+        self.last = now
+
+    def total(self):
+        return self.last - self.started
+
+    def report(self, top=15):
+        self.imports.uninstall()
+        lines = ["Startup phases:"]
+        for label, seconds in self.phases:
+            lines.append(f"  {label:<40} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total':<40} {self.total() * 1000:8.1f} ms")
+        lines.append(f"Slowest of {len(self.imports.records)} imported modules (self / cumulative):")
+        for name, total, own in self.imports.slowest(top):
+            lines.append(f"  {name:<40} {own * 1000:8.1f} ms {total * 1000:8.1f} ms")
+        return "\n".join(lines)
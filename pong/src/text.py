@@ -0,0 +1,26 @@
+"""
+Shared cache of rendered text. Scores, labels, button captions and screen titles mostly show
+the same strings frame after frame, so each (font, string, color, antialias) is rasterised once
+and reused until it drops out of the bounded cache.
+"""
+from .config import TEXT_CACHE_SIZE
+from .lru import LRUCache
+
+TEXT_CACHE = LRUCache(TEXT_CACHE_SIZE)
+
+
+def render_text(font, text, color, antialias=True):
+    """Return ``font.render(text, antialias, color)``, rendering only on a cache miss."""
+    # Fonts are keyed by identity; the key keeps the font alive, so its id is never reused
+    key = (font, text, tuple(color), bool(antialias))
+    return TEXT_CACHE.get_or_create(key, lambda: font.render(text, antialias, color))
+
+
+def text_cache_stats():
+    """Hit and miss counts of the text cache since start-up."""
+    return {
+        'hits': TEXT_CACHE.hits,
+        'misses': TEXT_CACHE.misses,
+        'hit_rate': TEXT_CACHE.hit_rate(),
+        'entries': len(TEXT_CACHE),
+    }
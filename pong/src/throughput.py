@@ -0,0 +1,121 @@
+"""
+Per-generation training throughput, appended to a JSON Lines metrics file.
+
+Each generation's wall time is split into evaluation (from the start of the generation until every
+genome has a fitness), reproduction, speciation and checkpointing; the last three are timed by
+wrapping the population's and checkpointer's methods. With the simulated world ticks and
+network activations the evaluator reports, that gives ticks/s, activations/s and genomes/s during
+evaluation, plus the fitness cache's hit rate when there is one. One line is appended per
+generation, so the file can be tailed or scraped while a long run is going.
+"""
+import sys
+import json
+import time
+import functools
+from neat.reporting import BaseReporter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PHASES = ('reproduction', 'speciation', 'checkpoint')
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where getrusage is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class ThroughputReporter(BaseReporter):
+    def __init__(self, path, counts, island=None):
+        self.path = path
+        # Returns running totals: simulated world 'ticks', network 'activations' and, with a
+        # fitness cache, 'cache_hits' and 'cache_misses'
+        self.counts = counts
+        self.island = island
+        self.generation = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.started = 0.0
+        self.started_counts = {}
+        # The generation's evaluation numbers, written once the rest of the generation is timed
+        self.evaluation = None
+
+    def attach(self, population, checkpointer=None):
+        """Add the reporter to ``population`` and time its reproduction, speciation and checkpoints."""
+        self.time_calls(population.reproduction, 'reproduce', 'reproduction')
+        self.time_calls(population.species, 'speciate', 'speciation')
+        if checkpointer is not None:
+            self.time_calls(checkpointer, 'save_checkpoint', 'checkpoint')
+        population.add_reporter(self)
+
+    def time_calls(self, owner, name, phase):
+        """Add the run time of every call of the method ``owner.name`` to ``phase``."""
+        method = getattr(owner, name)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.phases[phase] += time.perf_counter() - started
+
+        setattr(owner, name, wrapper)
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.started_counts = self.counts()
+        self.started = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        seconds = time.perf_counter() - self.started
+        self.evaluation = {name: total - self.started_counts[name] for name, total in self.counts().items()}
+        self.evaluation.update(seconds=seconds, genomes=len(population), species=len(species.species))
+
+    def end_generation(self, config, population, species_set):
+        self.write()
+
+    def found_solution(self, config, generation, best):
+        # The run stops before reproduction, so end_generation never comes for this generation
+        self.write()
+
+    def write(self):
+        if self.evaluation is None:
+            return
+        evaluation, self.evaluation = self.evaluation, None
+        seconds = evaluation['seconds']
+
+        def rate(count):
+            return round(count / seconds, 1) if seconds > 0 else None
+
+        record = {
+            'generation': self.generation,
+            'time': round(time.time(), 3),
+            'genomes': evaluation['genomes'],
+            'species': evaluation['species'],
+            'wall_s': round(time.perf_counter() - self.started, 6),
+            'evaluation_s': round(seconds, 6),
+        }
+        record.update((f'{phase}_s', round(self.phases[phase], 6)) for phase in PHASES)
+        record.update({
+            'ticks': evaluation['ticks'],
+            'activations': evaluation['activations'],
+            'ticks_per_s': rate(evaluation['ticks']),
+            'activations_per_s': rate(evaluation['activations']),
+            'genomes_per_s': rate(evaluation['genomes']),
+            'peak_rss_mb': peak_rss_mb(),
+        })
+        if 'cache_hits' in evaluation:
+            record['cache_hits'] = evaluation['cache_hits']
+            record['cache_hit_rate'] = round(evaluation['cache_hits'] / max(1, evaluation['genomes']), 4)
+        if self.island is not None:
+            record['island'] = self.island
+        # One write per line keeps lines from concurrent islands whole
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
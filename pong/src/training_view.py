@@ -0,0 +1,126 @@
+"""
+What the training window shows while a generation plays out.
+
+Drawing all 150 genomes' balls and paddles every tick made visual training many times slower
+than headless training. The view draws only the fittest few by default, shows genomes only every
+``render_generations``-th generation and batches every sprite into one ``Surface.blits`` call.
+
+Turbo runs several simulation ticks per drawn frame: ``render_interval`` of them, or with 0 as
+many as fit in one frame at FRAME_RATE. While training, V cycles the full, top and stats views,
++ and - double or halve the ticks per frame and A switches to fitting ticks into the frame time.
+"""
+import time
+import pygame
+import numpy as np
+from .config import WIDTH, BLACK, WHITE, FRAME_RATE, TURBO_MAX_TICKS_PER_FRAME
+from .physics import LEFT, RIGHT
+from .text import render_text
+
+VIEWS = ('full', 'top', 'stats')
+
+
+class TrainingView:
+    def __init__(self, screen, font, view='top', top_k=10, render_interval=1, render_generations=1):
+        if view not in VIEWS:
+            raise ValueError(f"Unknown training view {view!r}")
+        self.screen = screen
+        self.font = font
+        self.view = view
+        self.top_k = top_k
+        # Ticks per drawn frame, or fit as many ticks as the frame time allows when auto
+        self.auto = render_interval == 0
+        self.ticks_per_frame = max(1, render_interval)
+        self.render_generations = max(1, render_generations)
+        self.clock = pygame.time.Clock()
+
+        self.ticks_since_frame = 0
+        self.last_frame = time.perf_counter()
+        # Simulation speed shown in the HUD, measured over about half a second
+        self.ticks_per_second = 0.0
+        self.rate_ticks = 0
+        self.rate_started = self.last_frame
+
+    def cycle(self):
+        self.view = VIEWS[(VIEWS.index(self.view) + 1) % len(VIEWS)]
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_v:
+            self.cycle()
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.auto = False
+            self.ticks_per_frame = min(self.ticks_per_frame * 2, TURBO_MAX_TICKS_PER_FRAME)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.auto = False
+            self.ticks_per_frame = max(self.ticks_per_frame // 2, 1)
+        elif event.key == pygame.K_a:
+            self.auto = not self.auto
+
+    def shows_genomes(self, generation):
+        """Whether genomes are drawn in ``generation``; the first one always is."""
+        return (generation - 1) % self.render_generations == 0
+
+    def select(self, engine):
+        """Indices of the live worlds to draw, fittest first in the top view."""
+        alive = np.flatnonzero(engine.alive)
+        if self.view == 'stats':
+            return alive[:0]
+        if self.view == 'full' or len(alive) <= self.top_k:
+            return alive
+        fitness = engine.fitness[alive]
+        best = np.argpartition(-fitness, self.top_k)[:self.top_k]
+        return alive[best[np.argsort(-fitness[best], kind='stable')]]
+
+    def draw(self, engine, paddles, paddles_r, balls, generation):
+        """
+        Count one simulation tick and draw it if a frame is due. Returns whether a frame was
+        drawn; genome views are synced to the engine only then.
+        """
+        self.ticks_since_frame += 1
+        genomes_visible = self.view != 'stats' and self.shows_genomes(generation)
+        now = time.perf_counter()
+        if self.auto or not genomes_visible:
+            # Fit ticks into the frame time; nothing moves on a stats-only frame either, so it is
+            # redrawn at most FRAME_RATE times a second while the simulation runs unthrottled
+            if now - self.last_frame < 1 / FRAME_RATE:
+                return False
+        elif self.ticks_since_frame < self.ticks_per_frame:
+            return False
+
+        self.rate_ticks += self.ticks_since_frame
+        if now - self.rate_started >= 0.5:
+            self.ticks_per_second = self.rate_ticks / (now - self.rate_started)
+            self.rate_ticks = 0
+            self.rate_started = now
+        self.ticks_since_frame = 0
+        self.last_frame = now
+
+        shown = self.select(engine) if genomes_visible else []
+        self.screen.fill(BLACK)
+
+        blits = []
+        for x in shown:
+            balls[x].sync(engine.rect_x[x], engine.rect_y[x], engine.ball_x[x], engine.ball_y[x],
+                          engine.hit_side[:, x].any())
+            blits += balls[x].sprites()
+        for side, views in ((LEFT, paddles), (RIGHT, paddles_r)):
+            for x in shown:
+                views[x].sync(engine.paddle_y[side, x], engine.hit_side[side, x])
+                blits += views[x].sprites()
+        self.screen.blits(blits, doreturn=False)
+
+        best = engine.fitness[engine.alive].max() if engine.alive.any() else 0.0
+        turbo = "auto" if self.auto else f"x{self.ticks_per_frame}"
+        labels = [f"Gens: {generation - 1}", f"Alive: {engine.alive_count()}", f"Best: {best:.0f}",
+                  f"Ticks/s: {self.ticks_per_second:.0f}", f"Turbo: {turbo} (+/-, A)"]
+        for i, label in enumerate(labels):
+            self.screen.blit(render_text(self.font, label, WHITE), (10, 10 + i * 40))
+        self.screen.blit(render_text(self.font, "Press ESC to exit", WHITE), (WIDTH - 300, 10))
+        self.screen.blit(render_text(self.font, f"View: {self.view} (V)", WHITE), (WIDTH - 300, 50))
+        pygame.display.flip()
+
+        # Only frames with genomes on them are held to the frame rate, unless ticks are fitted to it
+        if len(shown) and not self.auto:
+            self.clock.tick(FRAME_RATE)
+        return True
@@ -0,0 +1,171 @@
+"""
+Headless structure-of-arrays Pong engine used to evaluate a whole NEAT population at once.
+
+Every world (one genome controlling both paddles against one ball) lives in a slot of a set
+of NumPy arrays, and a single call to ``step`` advances all live worlds by one tick.
+"""
+import numpy as np
+from .config import WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_SIZE, BALL_SPEED
+from .physics import LEFT, RIGHT, PADDLE_X, ball_touches_paddle, bounce_off_paddle, bounce_off_walls
+from .physics import predict_impact_y, move_velocity_paddle, steer_velocity_paddle
+
+# Fitness shaping, identical to the original per-object trainer loop
+TICK_REWARD = 0.05  # Per side, per tick
+HIT_REWARD = 5
+MISS_PENALTY = 2
+
+
+def _splitmix64(x):
+    # uint64 arithmetic wraps around, which is exactly what the mixer needs
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_uniform(seeds, counters):
+    """Uniform [0, 1) numbers that only depend on each world's seed and draw counter."""
+    with np.errstate(over='ignore'):
+        x = _splitmix64(seeds ^ _splitmix64(counters.astype(np.uint64)))
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def derive_seeds(seed, generation, keys):
+    """Per-world seeds that depend only on the run seed, the generation and each genome key."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        base = _splitmix64(np.uint64(seed) ^ _splitmix64(np.uint64(generation)))
+        return _splitmix64(base ^ _splitmix64(keys))
+
+
+class VectorPongEngine:
+    def __init__(self, count, seeds=None, max_hits=None):
+        self.count = count
+        # Worlds that reach max_hits paddle hits finish without a miss penalty
+        self.max_hits = max_hits
+        if seeds is None:
+            seeds = np.random.randint(0, 2**63, size=count, dtype=np.uint64)
+        self.seeds = np.asarray(seeds, dtype=np.uint64)
+        # Per-world random draw counter, so results never depend on which worlds share a batch
+        self.draws = np.zeros(count, dtype=np.uint64)
+
+        # Ball state: sub-pixel position plus the integer rect position used for collisions
+        self.ball_x = np.full(count, float(WIDTH // 2))
+        self.ball_y = np.full(count, float(HEIGHT // 2))
+        self.rect_x = np.full(count, WIDTH // 2, dtype=np.int64)
+        self.rect_y = np.full(count, HEIGHT // 2, dtype=np.int64)
+        sign_x = np.where(self._uniform() < 0.5, -1.0, 1.0)
+        sign_y = np.where(self._uniform() < 0.5, -1.0, 1.0)
+        self.ball_dx = BALL_SPEED * sign_x
+        self.ball_dy = BALL_SPEED * sign_y
+        self.ball_speed = np.full(count, float(BALL_SPEED))
+
+        # Paddle state, indexed [side, world]
+        self.paddle_y = np.full((2, count), float(HEIGHT // 2 - PADDLE_HEIGHT // 2))
+        self.paddle_vel = np.zeros((2, count))
+
+        # Per-world bookkeeping
+        self.fitness = np.zeros(count)
+        self.hits = np.zeros(count, dtype=np.int64)
+        self.alive = np.ones(count, dtype=bool)
+        self.hit_side = np.zeros((2, count), dtype=bool)
+        self.ticks = 0
+
+    def _uniform(self, index=None):
+        if index is None:
+            values = hash_uniform(self.seeds, self.draws)
+            self.draws += np.uint64(1)
+        else:
+            values = hash_uniform(self.seeds[index], self.draws[index])
+            self.draws[index] += np.uint64(1)
+        return values
+
+    def alive_count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def stop(self, index):
+        """End the given worlds' episodes where they are; they keep the fitness earned so far."""
+        self.alive[index] = False
+
+    def move_paddles(self, side):
+        """Reward survival, then apply velocity, friction and bounds to one side's paddles."""
+        alive = self.alive
+        self.fitness[alive] += TICK_REWARD
+        y, vel = move_velocity_paddle(self.paddle_y[side], self.paddle_vel[side])
+        self.paddle_y[side] = np.where(alive, y, self.paddle_y[side])
+        self.paddle_vel[side] = np.where(alive, vel, self.paddle_vel[side])
+
+    def observe(self, side):
+        """
+        Return the worlds whose ball is heading for ``side`` and the network inputs for them:
+        paddle y, horizontal distance to the ball and the wall-folded predicted impact y.
+        """
+        if side == LEFT:
+            index = np.flatnonzero(self.alive & (self.ball_dx < 0))
+        else:
+            index = np.flatnonzero(self.alive & (self.ball_dx > 0))
+        ball_x = self.rect_x[index]
+        inputs = np.empty((len(index), 3))
+        inputs[:, 0] = self.paddle_y[side, index]
+        inputs[:, 1] = np.abs(PADDLE_X[side] - ball_x)
+        inputs[:, 2] = predict_impact_y(side, ball_x, self.rect_y[index], self.ball_dx[index], self.ball_dy[index])
+        return index, inputs
+
+    def control(self, side, index, outputs):
+        """Turn (N, 2) network outputs into up / down / stop for the given worlds."""
+        outputs = np.asarray(outputs, dtype=np.float64).reshape(len(index), 2)
+        self.paddle_vel[side, index] = steer_velocity_paddle(self.paddle_vel[side, index], outputs[:, 0], outputs[:, 1])
+
+    def _collide(self, side):
+        paddle_x = PADDLE_X[side]
+        paddle_y = self.paddle_y[side]
+        hit = self.alive & ball_touches_paddle(self.rect_x, self.rect_y, paddle_x, paddle_y)
+        index = np.flatnonzero(hit)
+        self.hit_side[side] = hit
+        if len(index) == 0:
+            return 0
+
+        self.ball_dx[index], self.ball_dy[index], self.ball_speed[index] = bounce_off_paddle(
+            self.ball_dx[index], self.ball_dy[index], self.ball_speed[index],
+            self.rect_y[index], paddle_y[index], self._uniform(index) - 0.5)
+
+        self.ball_x[index] = paddle_x + PADDLE_WIDTH if side == LEFT else paddle_x - BALL_SIZE
+        self.fitness[index] += HIT_REWARD
+        self.hits[index] += 1
+        return len(index)
+
+    def move_balls(self):
+        """Check both paddles, move every live ball, bounce off walls and retire missed worlds."""
+        hits = self._collide(LEFT) + self._collide(RIGHT)
+
+        alive = self.alive
+        self.ball_x = np.where(alive, self.ball_x + self.ball_dx, self.ball_x)
+        self.ball_y = np.where(alive, self.ball_y + self.ball_dy, self.ball_y)
+        self.rect_x = np.trunc(self.ball_x).astype(np.int64)
+        self.rect_y = np.trunc(self.ball_y).astype(np.int64)
+
+        ball_y, ball_dy = bounce_off_walls(self.ball_y, self.ball_dy, self.rect_y)
+        self.ball_y = np.where(alive, ball_y, self.ball_y)
+        self.ball_dy = np.where(alive, ball_dy, self.ball_dy)
+
+        missed = alive & ((self.rect_x < 0) | (self.rect_x > WIDTH))
+        self.fitness[missed] -= MISS_PENALTY
+        self.alive &= ~missed
+        if self.max_hits is not None:
+            self.alive &= self.hits < self.max_hits
+        self.ticks += 1
+        return hits
+
+    def step(self, policy):
+        """
+        Advance every live world by one tick.
+
+        ``policy(side, index, inputs)`` receives the worlds whose ball is heading for ``side`` and
+        their (N, 3) inputs, and must return (N, 2) outputs. Returns the number of paddle hits.
+        """
+        for side in (LEFT, RIGHT):
+            self.move_paddles(side)
+            index, inputs = self.observe(side)
+            if len(index):
+                self.control(side, index, policy(side, index, inputs))
+        return self.move_balls()
@@ -0,0 +1,32 @@
+import os
+import sys
+import random
+import neat
+import pytest
+
+# Nothing in the tests opens a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def neat_config():
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, os.path.join(ROOT, 'config.txt'))
+
+
+@pytest.fixture
+def make_genomes(neat_config):
+    """Returns make(count, mutations, seed): (key, genome) pairs grown by ``mutations`` random mutations."""
+    def make(count, mutations=5, seed=0):
+        random.seed(seed)
+        genomes = []
+        for key in range(count):
+            genome = neat_config.genome_type(key)
+            genome.configure_new(neat_config.genome_config)
+            for _ in range(mutations):
+                genome.mutate(neat_config.genome_config)
+            genomes.append((key, genome))
+        return genomes
+    return make
@@ -0,0 +1,29 @@
+import random
+import neat
+import numpy as np
+import pytest
+from src.batch_network import ACTIVATIONS, BatchNetwork, compile_genome, network_from_spec
+
+
+@pytest.mark.parametrize('mixed_activations', [False, True])
+def test_batch_network_matches_feed_forward_network(neat_config, make_genomes, mixed_activations):
+    genomes = [g for _, g in make_genomes(30, mutations=20)]
+    if mixed_activations:
+        rng = random.Random(1)
+        for genome in genomes:
+            for node in genome.nodes.values():
+                node.activation = rng.choice(sorted(ACTIVATIONS))
+    inputs = np.random.default_rng(0).uniform(0, 600, (len(genomes), 3))
+    expected = [neat.nn.FeedForwardNetwork.create(g, neat_config).activate(row) for g, row in zip(genomes, inputs)]
+
+    batch = BatchNetwork.from_genomes(genomes, neat_config)
+    np.testing.assert_allclose(batch.activate(inputs), expected, rtol=1e-9, atol=1e-12)
+    rows = np.arange(0, len(genomes), 3)
+    np.testing.assert_allclose(batch.activate(inputs[rows], rows), [expected[r] for r in rows], rtol=1e-9, atol=1e-12)
+
+
+def test_compiled_genome_rebuilds_the_same_network(neat_config, make_genomes):
+    for _, genome in make_genomes(10, mutations=20):
+        net = neat.nn.FeedForwardNetwork.create(genome, neat_config)
+        rebuilt = network_from_spec(compile_genome(genome, neat_config))
+        assert rebuilt.activate([100.0, 250.0, 380.0]) == net.activate([100.0, 250.0, 380.0])
@@ -0,0 +1,54 @@
+import pytest
+from src import ai_trainer
+from src.ai_trainer import AITrainer
+from src.checkpoint import retained
+from src.evaluation import genome_hash
+from src.settings import TrainingSettings
+
+
+def train(directory, monkeypatch, generations, fitness_cache, resume=False):
+    """Run headless training up to ``generations`` and return the population it ended with."""
+    monkeypatch.chdir(directory)
+    monkeypatch.setattr(ai_trainer, 'GENERATIONS', generations)
+    settings = TrainingSettings(headless=True, max_hits=30, fitness_cache=fitness_cache, metrics_file='',
+                                checkpoint_dir=str(directory / 'checkpoints'))
+    trainer = AITrainer(None, settings)
+    trainer.config.pop_size = 40
+    trainer.run_neat(resume=resume)
+    return trainer.population
+
+
+def snapshot(population):
+    return {
+        'generation': population.generation,
+        'genomes': {key: genome_hash(g) for key, g in population.population.items()},
+        'species': population.species.genome_to_species,
+        'best': (population.best_genome.key, population.best_genome.fitness),
+    }
+
+
+@pytest.mark.parametrize('fitness_cache', [0, 4096])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, monkeypatch, fitness_cache):
+    (tmp_path / 'whole').mkdir()
+    (tmp_path / 'resumed').mkdir()
+    whole = train(tmp_path / 'whole', monkeypatch, 12, fitness_cache)
+    # Resumed twice, so the second resume starts from a checkpoint written by a resumed run
+    train(tmp_path / 'resumed', monkeypatch, 4, fitness_cache)
+    train(tmp_path / 'resumed', monkeypatch, 8, fitness_cache, resume=True)
+    resumed = train(tmp_path / 'resumed', monkeypatch, 12, fitness_cache, resume=True)
+    assert snapshot(resumed) == snapshot(whole)
+
+
+def test_fresh_run_leaves_other_runs_checkpoints(tmp_path, monkeypatch):
+    train(tmp_path, monkeypatch, 6, 0)
+    train(tmp_path, monkeypatch, 2, 0)
+    runs = sorted(path for path in (tmp_path / 'checkpoints').iterdir())
+    assert [sorted(p.name for p in run.iterdir()) for run in runs] == [
+        [f'gen-{g:06d}.ckpt' for g in range(2, 7)],
+        ['gen-000001.ckpt', 'gen-000002.ckpt'],
+    ]
+
+
+def test_retained():
+    assert retained(range(1, 121), 3, 50) == {50, 100, 118, 119, 120}
+    assert retained(range(1, 4), 0, 0) == set()
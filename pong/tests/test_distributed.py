@@ -0,0 +1,36 @@
+import socket
+import threading
+from src.distributed import EvaluationCoordinator, recv_message, run_worker, send_message
+from src.evaluation import GenomeEvaluator
+
+
+def test_malformed_result_drops_the_worker_and_requeues_its_batch(neat_config, make_genomes):
+    genomes = make_genomes(10, mutations=5)
+    episode = {'max_hits': 20}
+    GenomeEvaluator(1, 0, episode).evaluate(genomes, neat_config, 3)
+    expected = [g.fitness for _, g in genomes]
+
+    coordinator = EvaluationCoordinator(port=0, batch_size=len(genomes), episode=episode)
+    coordinator.start()
+    dropped = threading.Event()
+
+    def bad_worker():
+        sock = socket.create_connection((coordinator.host, coordinator.port))
+        send_message(sock, {'type': 'hello', 'name': 'bad'})
+        batch = recv_message(sock)
+        send_message(sock, {'type': 'result', 'id': batch['id'], 'fitness': [0.0] * len(batch['specs'])})
+        try:
+            recv_message(sock)
+        except ConnectionError:
+            dropped.set()
+        threading.Thread(target=run_worker, args=(coordinator.host, coordinator.port, 'good'), daemon=True).start()
+
+    threading.Thread(target=bad_worker, daemon=True).start()
+    try:
+        coordinator.evaluate(genomes, neat_config, 3)
+    finally:
+        coordinator.close()
+    assert dropped.is_set()
+    assert [g.fitness for _, g in genomes] == expected
+    assert {stats.name: (stats.batches, stats.lost_batches) for stats in coordinator.stats} == {
+        'bad': (0, 1), 'good': (1, 0)}
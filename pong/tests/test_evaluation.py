@@ -0,0 +1,81 @@
+import copy
+import threading
+import pytest
+from src.distributed import EvaluationCoordinator, run_worker
+from src.evaluation import FitnessCache, GenomeEvaluator
+
+
+def fitness_with(evaluator, genomes, config, generation=3):
+    try:
+        evaluator.evaluate(genomes, config, generation)
+    finally:
+        evaluator.close()
+    return [g.fitness for _, g in genomes]
+
+
+@pytest.mark.parametrize('engine', ['vector', 'event'])
+def test_fitness_does_not_depend_on_worker_count(neat_config, make_genomes, engine):
+    genomes = make_genomes(40, mutations=10)
+    episode = {'max_hits': 20, 'engine': engine}
+    single = fitness_with(GenomeEvaluator(1, 0, episode), genomes, neat_config)
+    assert fitness_with(GenomeEvaluator(3, 0, episode), genomes, neat_config) == single
+    # Another generation plays other episodes, so the comparison above is not comparing constants
+    assert fitness_with(GenomeEvaluator(3, 0, episode), genomes, neat_config, generation=4) != single
+
+
+def test_cached_fitness_matches_fresh_evaluation(neat_config, make_genomes):
+    genomes = make_genomes(30, mutations=10)
+    # A copy of a genome under another key, like an elite carried over
+    genomes.append((100, copy.deepcopy(genomes[0][1])))
+    evaluator = GenomeEvaluator(1, 0, {'max_hits': 20})
+    cache = FitnessCache(1000)
+    cache.evaluate(evaluator, genomes, neat_config, 3)
+    fresh = [g.fitness for _, g in genomes]
+    assert (cache.hits, cache.misses) == (1, 30)
+    assert fresh[-1] == fresh[0]
+
+    for _, genome in genomes:
+        genome.fitness = None
+    ticks, activations, _ = cache.evaluate(evaluator, genomes, neat_config, 4)
+    assert [g.fitness for _, g in genomes] == fresh
+    assert (ticks, activations, cache.hits, cache.misses) == (0, 0, 32, 30)
+    # Playing them again from an empty cache, in another generation, gives the same fitness
+    FitnessCache(1000).evaluate(evaluator, genomes, neat_config, 7)
+    assert [g.fitness for _, g in genomes] == fresh
+
+
+@pytest.mark.parametrize('engine', ['vector', 'event'])
+def test_stages_pick_survivors_across_the_whole_generation(neat_config, make_genomes, engine):
+    genomes = make_genomes(60, mutations=10)
+    episode = {'max_hits': 20, 'engine': engine}
+    stages = {'stage_ticks': [60, 240, 960], 'stage_keep': 0.25}
+    single = GenomeEvaluator(1, 0, episode, stages)
+    _, _, eliminated = single.evaluate(genomes, neat_config, 3)
+    fitness = [g.fitness for _, g in genomes]
+    assert len(eliminated) > 10
+
+    pool = GenomeEvaluator(3, 0, episode, stages)
+    try:
+        assert pool.evaluate(genomes, neat_config, 3)[2] == eliminated
+    finally:
+        pool.close()
+    assert [g.fitness for _, g in genomes] == fitness
+
+    coordinator = EvaluationCoordinator(port=0, batch_size=7, episode=episode, stages=stages)
+    coordinator.start()
+    for name in ('a', 'b'):
+        threading.Thread(target=run_worker, args=(coordinator.host, coordinator.port, name), daemon=True).start()
+    try:
+        assert coordinator.evaluate(genomes, neat_config, 3)[2] == eliminated
+    finally:
+        coordinator.close()
+    assert [g.fitness for _, g in genomes] == fitness
+
+
+def test_genomes_stopped_by_a_stage_are_not_cached(neat_config, make_genomes):
+    genomes = make_genomes(60, mutations=10)
+    evaluator = GenomeEvaluator(1, 0, {'max_hits': 20}, {'stage_ticks': [60, 240], 'stage_keep': 0.25})
+    cache = FitnessCache(1000)
+    _, _, eliminated = cache.evaluate(evaluator, genomes, neat_config, 3)
+    assert eliminated
+    assert len(cache.entries) == len(genomes) - len(eliminated)
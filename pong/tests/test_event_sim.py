@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from src.config import PADDLE_HEIGHT
+from src.evaluation import play_specs
+from src.batch_network import compile_genome
+from src.event_sim import EventPongSimulator
+from src.vector_engine import VectorPongEngine, derive_seeds
+
+
+def tracking_outputs(inputs):
+    """Up / down outputs that steer a paddle towards the predicted impact, so rallies run long."""
+    inputs = np.asarray(inputs, dtype=np.float64).reshape(-1, 3)
+    offset = inputs[:, 0] + PADDLE_HEIGHT / 2 - inputs[:, 2]
+    return np.stack([offset > 4, offset < -4], axis=1).astype(np.float64)
+
+
+def test_event_simulator_matches_vector_engine_on_long_rallies():
+    seeds = derive_seeds(0, 0, list(range(24)))
+    worlds = VectorPongEngine(len(seeds), seeds, max_hits=40)
+    while worlds.alive_count():
+        worlds.step(lambda side, index, inputs: tracking_outputs(inputs))
+
+    simulators = [EventPongSimulator(seed, max_hits=40) for seed in seeds]
+    for simulator in simulators:
+        simulator.run(lambda side, inputs: tracking_outputs(inputs)[0])
+
+    assert [s.hits for s in simulators] == worlds.hits.tolist()
+    assert [s.fitness for s in simulators] == pytest.approx(worlds.fitness.tolist(), abs=1e-9)
+    assert max(s.hits for s in simulators) == 40
+
+
+@pytest.mark.parametrize('max_ticks', [None, 150])
+def test_engines_give_the_same_fitness_to_genomes(neat_config, make_genomes, max_ticks):
+    genomes = make_genomes(60, mutations=10)
+    specs = [compile_genome(g, neat_config) for _, g in genomes]
+    seeds = derive_seeds(0, 1, [key for key, _ in genomes])
+    vector = play_specs(specs, seeds, max_ticks, max_hits=20, engine='vector')
+    event = play_specs(specs, seeds, max_ticks, max_hits=20, engine='event')
+    assert event[0] == pytest.approx(vector[0], abs=1e-9)
+    # Still playing, simulated ticks and controller decisions
+    assert event[1:] == vector[1:]